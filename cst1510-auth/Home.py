@@ -1,5 +1,5 @@
 import streamlit as st
-from auth_db import user_exists, register_user, verify_user
+from auth_db import constant_eq, register_user, verify_user
 
 # ---------- Initialise session state ----------
 if "logged_in" not in st.session_state:
@@ -56,10 +56,9 @@ with tab_register:
     if st.button("Create account"):
         if not new_username or not new_password:
             st.warning("Please fill in all fields.")
-        elif new_password != confirm_password:
+        elif not constant_eq(new_password.encode("utf-8"), confirm_password.encode("utf-8")):
             st.error("Passwords do not match.")
-        elif user_exists(new_username):
-            st.error("Username already exists.")
-        else:
-            register_user(new_username, new_password)
+        elif register_user(new_username, new_password):
             st.success("Account created! You can now log in.")
+        else:
+            st.error("Username already exists.")
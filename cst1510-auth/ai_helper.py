@@ -1,20 +1,91 @@
 # ai_helper.py
 
+import hashlib
 import os
-from openai import OpenAI
+import threading
+import time
+from collections import OrderedDict
 
-# Create OpenAI client using the API key from environment variable
-client = OpenAI(
-    api_key=os.getenv("OPENAI_API_KEY")
-)
+# The OpenAI client is created on first use (see get_client), so pages
+# that import this module but never ask a question do not pay for
+# importing openai/httpx or setting up the client.
+_client = None
 
-def ask_ai(question: str, context: str = "") -> str:
+# Circuit breaker: after a failure, return the same error for a short
+# while instead of making every rerun wait for another timeout
+_COOLDOWN_SECONDS = 15
+_last_fail_ts = 0.0
+_last_error = ""
+
+# Answers to recently asked (question, context) pairs.
+# Keyed by a short hash so long contexts are not kept in memory twice.
+_CACHE_SIZE = 256
+# Shared by every Streamlit session thread, so each lookup and each
+# insert-plus-evict holds the lock.
+_answers: "OrderedDict[str, str]" = OrderedDict()
+_answers_lock = threading.Lock()
+
+
+def get_client():
+    """Return the shared OpenAI client, creating it on the first call."""
+    global _client
+    if _client is None:
+        import httpx
+        from openai import OpenAI
+
+        # Give up on a slow request instead of blocking the Streamlit page
+        timeout = httpx.Timeout(20.0, connect=5.0)
+
+        # Create OpenAI client using the API key from environment variable.
+        # One keep-alive HTTP connection pool is shared by every request, so
+        # repeated questions reuse the TLS connection instead of doing a
+        # new handshake.
+        _client = OpenAI(
+            api_key=os.getenv("OPENAI_API_KEY"),
+            http_client=httpx.Client(
+                timeout=timeout,
+                limits=httpx.Limits(max_keepalive_connections=8),
+            ),
+            timeout=timeout,
+            max_retries=2,  # retried with exponential backoff by the client
+        )
+    return _client
+
+
+def _cache_key(question: str, context: str) -> str:
+    """Return a fixed-size key for a (question, context) pair."""
+    data = f"{question}\0{context}".encode("utf-8")
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def ask_ai(question: str, context: str = ""):
     """
     Ask the OpenAI API a question about the IT tickets.
     Optionally include a context string (summary of the data).
+
+    This is a generator: the answer is yielded piece by piece as the
+    tokens arrive, so a UI can start showing it straight away
+    (e.g. st.write_stream). Errors are yielded as a message string.
     """
-    if not client.api_key:
-        return "OpenAI API error: OPENAI_API_KEY environment variable is not set."
+    global _last_fail_ts, _last_error
+
+    if not os.getenv("OPENAI_API_KEY"):
+        yield "OpenAI API error: OPENAI_API_KEY environment variable is not set."
+        return
+
+    if time.monotonic() - _last_fail_ts < _COOLDOWN_SECONDS:
+        yield _last_error
+        return
+
+    # Identical question on the same data: reuse the previous answer
+    key = _cache_key(question, context)
+    with _answers_lock:
+        cached = _answers.get(key)
+        if cached is not None:
+            _answers.move_to_end(key)
+    if cached is not None:
+        yield cached
+        return
 
     # Build prompt
     system_message = (
@@ -32,8 +103,9 @@ def ask_ai(question: str, context: str = "") -> str:
     else:
         user_content = question
 
+    parts = []
     try:
-        response = client.chat.completions.create(
+        stream = get_client().chat.completions.create(
             model="gpt-4o-mini",
             messages=[
                 {"role": "system", "content": system_message},
@@ -41,16 +113,34 @@ def ask_ai(question: str, context: str = "") -> str:
             ],
             temperature=0.3,
             max_tokens=400,
+            stream=True,
         )
 
-        # For the new OpenAI client, content is in choices[0].message.content
-        answer = response.choices[0].message.content
-        if isinstance(answer, str):
-            return answer.strip()
-        else:
-            # If content comes back as a list of parts, join them
-            return "".join(part.get("text", "") for part in answer).strip()
+        # Each chunk carries the next few tokens in choices[0].delta.content
+        for chunk in stream:
+            if not chunk.choices:
+                continue
+            delta = chunk.choices[0].delta.content
+            if delta:
+                parts.append(delta)
+                yield delta
 
     except Exception as e:
         # Always return a clean error message as a string
-        return f"OpenAI API error: {type(e).__name__}: {e}"
+        _last_error = f"OpenAI API error: {type(e).__name__}: {e}"
+        _last_fail_ts = time.monotonic()
+        yield _last_error
+        return
+
+    # Only complete answers are cached, never error messages
+    answer = "".join(parts).strip()
+    with _answers_lock:
+        _answers[key] = answer
+        _answers.move_to_end(key)
+        if len(_answers) > _CACHE_SIZE:
+            _answers.popitem(last=False)
+
+
+def ask_ai_sync(question: str, context: str = "") -> str:
+    """Same as ask_ai, but waits for the whole answer and returns it as one string."""
+    return "".join(ask_ai(question, context=context)).strip()
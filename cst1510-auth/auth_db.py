@@ -1,41 +1,64 @@
 import sqlite3
-import bcrypt
+import threading
+from hmac import compare_digest
+import streamlit as st
+from password_hashing import check_password, password_hasher as _ph
+
+# Timing-safe equality for secrets (hashes, tokens, passwords); use it
+# instead of == so comparisons do not stop at the first differing byte
+constant_eq = compare_digest
 
 DB_PATH = "database.db"   
 
+# Serialises writers on the shared connection
+_write_lock = threading.Lock()
+
+# Checked against when the username does not exist, so a miss costs the
+# same hashing work as a hit and login timing does not reveal which
+# usernames are registered.
+_DUMMY_HASH = _ph.hash("x")
+
+@st.cache_resource(show_spinner=False)
 def get_conn():
-    return sqlite3.connect(DB_PATH)
-
-def user_exists(username: str) -> bool:
-    with get_conn() as conn:
-        cur = conn.cursor()
-        cur.execute("SELECT 1 FROM users WHERE username = ?;", (username,))
-        return cur.fetchone() is not None
-
-def register_user(username: str, plain_password: str) -> None:
-    # hash με bcrypt
-    password_bytes = plain_password.encode("utf-8")
-    hashed = bcrypt.hashpw(password_bytes, bcrypt.gensalt()).decode("utf-8")
-
-    with get_conn() as conn:
-        cur = conn.cursor()
-        cur.execute(
-            "INSERT INTO users (username, password_hash) VALUES (?, ?);",
+    # One connection per Streamlit process (not per rerun), reused by
+    # every login / register call
+    conn = sqlite3.connect(DB_PATH, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL;")
+    return conn
+
+def register_user(username: str, plain_password: str) -> bool:
+    """
+    Create the user in a single statement.
+    Returns False (and inserts nothing) if the username is already taken.
+    """
+    hashed = _ph.hash(plain_password)
+
+    conn = get_conn()
+    with _write_lock, conn:
+        row = conn.execute(
+            "INSERT OR IGNORE INTO users (username, password_hash) VALUES (?, ?) RETURNING id;",
             (username, hashed),
-        )
-        conn.commit()
+        ).fetchone()
+    return row is not None
 
 def verify_user(username: str, plain_password: str) -> bool:
-    with get_conn() as conn:
-        cur = conn.cursor()
-        cur.execute(
-            "SELECT password_hash FROM users WHERE username = ?;",
-            (username,),
-        )
-        row = cur.fetchone()
-
-    if not row:
+    row = get_conn().execute(
+        "SELECT password_hash FROM users WHERE username = ?;",
+        (username,),
+    ).fetchone()
+
+    # Always run the hash check (no early return for unknown users)
+    stored_hash = row[0] if row else _DUMMY_HASH
+    matches = check_password(stored_hash, plain_password)
+    if not (matches and row is not None):
         return False
 
-    stored_hash = row[0].encode("utf-8")
-    return bcrypt.checkpw(plain_password.encode("utf-8"), stored_hash)
+    # Upgrade old bcrypt hashes to Argon2 on successful login
+    if stored_hash.startswith("$2") or _ph.check_needs_rehash(stored_hash):
+        conn = get_conn()
+        with _write_lock, conn:
+            conn.execute(
+                "UPDATE users SET password_hash = ? WHERE username = ?;",
+                (_ph.hash(plain_password), username),
+            )
+    return True
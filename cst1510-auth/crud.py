@@ -3,6 +3,21 @@ from db_manager import DatabaseManager
 # -----------------------------------
 #  CYBER INCIDENTS CRUD
 # -----------------------------------
+# SQL is kept in module-level constants so every call passes the same
+# string and hits sqlite3's prepared-statement cache.
+SQL_INSERT_INCIDENT = """
+    INSERT INTO cyber_incidents
+    (incident_type, severity, response_time_hours, status, reported_at)
+    VALUES (?, ?, ?, ?, ?);
+"""
+SQL_LIST_INCIDENTS = (
+    "SELECT id, incident_type, severity, response_time_hours, status, reported_at "
+    "FROM cyber_incidents;"
+)
+SQL_UPDATE_INCIDENT_STATUS = "UPDATE cyber_incidents SET status = ? WHERE id = ?;"
+SQL_DELETE_INCIDENT = "DELETE FROM cyber_incidents WHERE id = ?;"
+
+
 def create_cyber_incident(db: DatabaseManager):
     print("\n--- CREATE CYBER INCIDENT ---")
     incident_type = input("Incident type (e.g. phishing, malware): ").strip()
@@ -21,11 +36,7 @@ def create_cyber_incident(db: DatabaseManager):
             response_time = None
 
     db.execute(
-        """
-        INSERT INTO cyber_incidents
-        (incident_type, severity, response_time_hours, status, reported_at)
-        VALUES (?, ?, ?, ?, ?);
-        """,
+        SQL_INSERT_INCIDENT,
         (incident_type, severity, response_time, status, reported_at),
     )
     print("✓ Cyber incident created!")
@@ -33,11 +44,7 @@ def create_cyber_incident(db: DatabaseManager):
 
 def list_cyber_incidents(db: DatabaseManager):
     print("\n--- LIST CYBER INCIDENTS ---")
-    rows = db.execute(
-        "SELECT id, incident_type, severity, response_time_hours, status, reported_at "
-        "FROM cyber_incidents;",
-        fetchall=True,
-    )
+    rows = db.execute(SQL_LIST_INCIDENTS, fetchall=True)
     if not rows:
         print("No cyber incidents found.")
         return
@@ -56,10 +63,7 @@ def update_cyber_incident(db: DatabaseManager):
         return
 
     new_status = input("New status: ").strip()
-    db.execute(
-        "UPDATE cyber_incidents SET status = ? WHERE id = ?;",
-        (new_status, incident_id),
-    )
+    db.execute(SQL_UPDATE_INCIDENT_STATUS, (new_status, incident_id))
     print("✓ Incident updated!")
 
 
@@ -71,13 +75,27 @@ def delete_cyber_incident(db: DatabaseManager):
         print("No ID provided.")
         return
 
-    db.execute("DELETE FROM cyber_incidents WHERE id = ?;", (incident_id,))
+    db.execute(SQL_DELETE_INCIDENT, (incident_id,))
     print("✓ Incident deleted!")
 
 
 # -----------------------------------
 #  DATASETS_METADATA CRUD
 # -----------------------------------
+SQL_INSERT_DATASET = """
+    INSERT INTO datasets_metadata
+    (dataset_name, owner, size_mb, department, created_at)
+    VALUES (?, ?, ?, ?, ?);
+"""
+SQL_LIST_DATASETS = (
+    "SELECT id, dataset_name, owner, size_mb, department, created_at "
+    "FROM datasets_metadata;"
+)
+SQL_UPDATE_DATASET_OWNER = "UPDATE datasets_metadata SET owner = ? WHERE id = ?;"
+SQL_UPDATE_DATASET_DEPARTMENT = "UPDATE datasets_metadata SET department = ? WHERE id = ?;"
+SQL_DELETE_DATASET = "DELETE FROM datasets_metadata WHERE id = ?;"
+
+
 def create_dataset(db: DatabaseManager):
     print("\n--- CREATE DATASET METADATA ---")
     name = input("Dataset name: ").strip()
@@ -96,11 +114,7 @@ def create_dataset(db: DatabaseManager):
             size_value = None
 
     db.execute(
-        """
-        INSERT INTO datasets_metadata
-        (dataset_name, owner, size_mb, department, created_at)
-        VALUES (?, ?, ?, ?, ?);
-        """,
+        SQL_INSERT_DATASET,
         (name, owner, size_value, department, created_at),
     )
     print("✓ Dataset metadata created!")
@@ -108,11 +122,7 @@ def create_dataset(db: DatabaseManager):
 
 def list_datasets(db: DatabaseManager):
     print("\n--- LIST DATASETS METADATA ---")
-    rows = db.execute(
-        "SELECT id, dataset_name, owner, size_mb, department, created_at "
-        "FROM datasets_metadata;",
-        fetchall=True,
-    )
+    rows = db.execute(SQL_LIST_DATASETS, fetchall=True)
     if not rows:
         print("No datasets found.")
         return
@@ -133,10 +143,12 @@ def update_dataset(db: DatabaseManager):
     new_owner = input("New owner (leave empty to keep current): ").strip()
     new_dept = input("New department (leave empty to keep current): ").strip()
 
-    if new_owner:
-        db.execute("UPDATE datasets_metadata SET owner = ? WHERE id = ?;", (new_owner, dataset_id))
-    if new_dept:
-        db.execute("UPDATE datasets_metadata SET department = ? WHERE id = ?;", (new_dept, dataset_id))
+    # Both changes are committed together
+    with db.transaction():
+        if new_owner:
+            db.execute(SQL_UPDATE_DATASET_OWNER, (new_owner, dataset_id))
+        if new_dept:
+            db.execute(SQL_UPDATE_DATASET_DEPARTMENT, (new_dept, dataset_id))
 
     print("✓ Dataset metadata updated!")
 
@@ -149,13 +161,26 @@ def delete_dataset(db: DatabaseManager):
         print("No ID provided.")
         return
 
-    db.execute("DELETE FROM datasets_metadata WHERE id = ?;", (dataset_id,))
+    db.execute(SQL_DELETE_DATASET, (dataset_id,))
     print("✓ Dataset deleted!")
 
 
 # -----------------------------------
 #  IT_TICKETS CRUD
 # -----------------------------------
+SQL_INSERT_TICKET = """
+    INSERT INTO it_tickets
+    (ticket_number, issue_type, severity, assigned_to, opened_at, status)
+    VALUES (?, ?, ?, ?, ?, ?);
+"""
+SQL_LIST_TICKETS = (
+    "SELECT id, ticket_number, issue_type, severity, assigned_to, opened_at, status "
+    "FROM it_tickets;"
+)
+SQL_UPDATE_TICKET_STATUS = "UPDATE it_tickets SET status = ? WHERE id = ?;"
+SQL_DELETE_TICKET = "DELETE FROM it_tickets WHERE id = ?;"
+
+
 def create_ticket(db: DatabaseManager):
     print("\n--- CREATE IT TICKET ---")
     ticket_number = input("Ticket number (string or ID): ").strip()
@@ -166,11 +191,7 @@ def create_ticket(db: DatabaseManager):
     status = input("Status (open/in progress/resolved/closed): ").strip()
 
     db.execute(
-        """
-        INSERT INTO it_tickets
-        (ticket_number, issue_type, severity, assigned_to, opened_at, status)
-        VALUES (?, ?, ?, ?, ?, ?);
-        """,
+        SQL_INSERT_TICKET,
         (ticket_number, issue_type, severity, assigned_to, opened_at, status),
     )
     print("✓ IT ticket created!")
@@ -178,11 +199,7 @@ def create_ticket(db: DatabaseManager):
 
 def list_tickets(db: DatabaseManager):
     print("\n--- LIST IT TICKETS ---")
-    rows = db.execute(
-        "SELECT id, ticket_number, issue_type, severity, assigned_to, opened_at, status "
-        "FROM it_tickets;",
-        fetchall=True,
-    )
+    rows = db.execute(SQL_LIST_TICKETS, fetchall=True)
     if not rows:
         print("No IT tickets found.")
         return
@@ -201,10 +218,7 @@ def update_ticket(db: DatabaseManager):
         return
 
     new_status = input("New status: ").strip()
-    db.execute(
-        "UPDATE it_tickets SET status = ? WHERE id = ?;",
-        (new_status, ticket_id),
-    )
+    db.execute(SQL_UPDATE_TICKET_STATUS, (new_status, ticket_id))
     print("✓ Ticket updated!")
 
 
@@ -216,37 +230,64 @@ def delete_ticket(db: DatabaseManager):
         print("No ID provided.")
         return
 
-    db.execute("DELETE FROM it_tickets WHERE id = ?;", (ticket_id,))
+    db.execute(SQL_DELETE_TICKET, (ticket_id,))
     print("✓ Ticket deleted!")
 
 
 # -----------------------------------
 #  MAIN MENU
 # -----------------------------------
+MENU = "\n".join(
+    [
+        "",
+        "=" * 60,
+        "   MULTI-DOMAIN INTELLIGENCE PLATFORM - CRUD",
+        "=" * 60,
+        "CYBER INCIDENTS",
+        "[ 1] Create cyber incident",
+        "[ 2] List cyber incidents",
+        "[ 3] Update cyber incident status",
+        "[ 4] Delete cyber incident",
+        "-" * 60,
+        "DATASETS METADATA",
+        "[ 5] Create dataset metadata",
+        "[ 6] List datasets",
+        "[ 7] Update dataset (owner/department)",
+        "[ 8] Delete dataset",
+        "-" * 60,
+        "IT TICKETS",
+        "[ 9] Create IT ticket",
+        "[10] List IT tickets",
+        "[11] Update IT ticket status",
+        "[12] Delete IT ticket",
+        "-" * 60,
+        "[13] Exit",
+        "-" * 60,
+    ]
+)
+
+# Menu choice -> handler (option 13 / exit is handled in main)
+HANDLERS = {
+    # Cyber incidents
+    "1": create_cyber_incident,
+    "2": list_cyber_incidents,
+    "3": update_cyber_incident,
+    "4": delete_cyber_incident,
+    # Datasets
+    "5": create_dataset,
+    "6": list_datasets,
+    "7": update_dataset,
+    "8": delete_dataset,
+    # IT tickets
+    "9": create_ticket,
+    "10": list_tickets,
+    "11": update_ticket,
+    "12": delete_ticket,
+}
+
+
 def display_menu():
-    print("\n" + "=" * 60)
-    print("   MULTI-DOMAIN INTELLIGENCE PLATFORM - CRUD")
-    print("=" * 60)
-    print("CYBER INCIDENTS")
-    print("[ 1] Create cyber incident")
-    print("[ 2] List cyber incidents")
-    print("[ 3] Update cyber incident status")
-    print("[ 4] Delete cyber incident")
-    print("-" * 60)
-    print("DATASETS METADATA")
-    print("[ 5] Create dataset metadata")
-    print("[ 6] List datasets")
-    print("[ 7] Update dataset (owner/department)")
-    print("[ 8] Delete dataset")
-    print("-" * 60)
-    print("IT TICKETS")
-    print("[ 9] Create IT ticket")
-    print("[10] List IT tickets")
-    print("[11] Update IT ticket status")
-    print("[12] Delete IT ticket")
-    print("-" * 60)
-    print("[13] Exit")
-    print("-" * 60)
+    print(MENU)
 
 
 def main():
@@ -258,39 +299,13 @@ def main():
             display_menu()
             choice = input("Select an option (1-13): ").strip()
 
-            # Cyber incidents
-            if choice == "1":
-                create_cyber_incident(db)
-            elif choice == "2":
-                list_cyber_incidents(db)
-            elif choice == "3":
-                update_cyber_incident(db)
-            elif choice == "4":
-                delete_cyber_incident(db)
-
-            # Datasets
-            elif choice == "5":
-                create_dataset(db)
-            elif choice == "6":
-                list_datasets(db)
-            elif choice == "7":
-                update_dataset(db)
-            elif choice == "8":
-                delete_dataset(db)
-
-            # IT tickets
-            elif choice == "9":
-                create_ticket(db)
-            elif choice == "10":
-                list_tickets(db)
-            elif choice == "11":
-                update_ticket(db)
-            elif choice == "12":
-                delete_ticket(db)
-
-            elif choice == "13":
+            if choice == "13":
                 print("Exiting CRUD menu...")
                 break
+
+            handler = HANDLERS.get(choice)
+            if handler:
+                handler(db)
             else:
                 print("Invalid option. Please choose 1–13.")
     finally:
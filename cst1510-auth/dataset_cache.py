@@ -0,0 +1,73 @@
+# dataset_cache.py
+#
+# Dataset metadata for the Data Science page, memoised across reruns so a
+# widget change does not re-query SQLite or rebuild the DataFrame.
+# Cached values are keyed on a version number; anything that writes
+# datasets must call bump_datasets_version() afterwards.
+
+import threading
+from dataclasses import fields
+from typing import Dict
+
+import pandas as pd
+import streamlit as st
+
+from models import DatasetMetadata
+
+# Other processes (load_data.py, the CLI) can change datasets too, so
+# cached values also expire after this many seconds
+DATASET_CACHE_TTL = 30
+
+# DataFrame columns, in DatasetMetadata field order
+DATASET_FIELDS = tuple(f.name for f in fields(DatasetMetadata))
+
+# A handful of labels repeated on every row: stored as pandas categories
+# (integer codes), so comparisons, isin() and group-bys test each label
+# once rather than every cell
+DATASET_CATEGORY_COLUMNS = ("sensitivity", "status")
+
+# Kept at module level rather than in st.session_state: two sessions
+# counting separately could reach the same number for different data
+_version = 0
+_version_lock = threading.Lock()
+
+
+def datasets_version() -> int:
+    """Current datasets version, passed to the cached loaders below."""
+    return _version
+
+
+def bump_datasets_version() -> None:
+    """Invalidate every cached dataset value; call after create/update/delete."""
+    global _version
+    with _version_lock:
+        _version += 1
+
+
+@st.cache_data(ttl=DATASET_CACHE_TTL, show_spinner=False)
+def load_datasets_by_id(version: int) -> Dict[int, DatasetMetadata]:
+    """{id: dataset} for every dataset; `version` only keys the cache."""
+    return {i.id: i for i in DatasetMetadata.get_all()}
+
+
+@st.cache_data(ttl=DATASET_CACHE_TTL, show_spinner=False)
+def load_datasets(version: int) -> pd.DataFrame:
+    """All datasets as a DataFrame; `version` only keys the cache."""
+    items = load_datasets_by_id(version).values()
+    # Built column by column: one list per field rather than a dict per row
+    df = pd.DataFrame({name: [getattr(i, name) for i in items] for name in DATASET_FIELDS})
+    df = df.astype({column: "category" for column in DATASET_CATEGORY_COLUMNS})
+    return df
+
+
+@st.cache_data(ttl=DATASET_CACHE_TTL, show_spinner=False)
+def load_dataset_kpis(version: int) -> Dict[str, float]:
+    """Dataset KPIs (see DatasetMetadata.summary), from SQL."""
+    return DatasetMetadata.summary()
+
+
+@st.cache_data(ttl=DATASET_CACHE_TTL, show_spinner=False)
+def load_source_counts(version: int) -> pd.DataFrame:
+    """Datasets per source (columns source, count), most common first, grouped by SQL."""
+    counts = DatasetMetadata.source_counts()
+    return pd.DataFrame({"source": list(counts), "count": list(counts.values())})
@@ -1,21 +1,77 @@
+import os
 import sqlite3
 
+# fsync policy for commits. NORMAL is safe with WAL (a power cut can lose
+# the last commit but never corrupts the file); set SQLITE_SYNCHRONOUS=FULL
+# where every commit must survive a power cut, or OFF for throwaway bulk loads.
+SQLITE_SYNCHRONOUS = os.getenv("SQLITE_SYNCHRONOUS", "NORMAL").upper()
+if SQLITE_SYNCHRONOUS not in {"OFF", "NORMAL", "FULL", "EXTRA"}:
+    raise ValueError(f"Invalid SQLITE_SYNCHRONOUS value: {SQLITE_SYNCHRONOUS!r}")
+
+
+# How long a statement waits for a locked database before failing
+DEFAULT_BUSY_TIMEOUT_MS = 5000
+
+
+def apply_pragmas(conn, busy_timeout_ms=DEFAULT_BUSY_TIMEOUT_MS):
+    """
+    Tune a new SQLite connection. Used by DatabaseManager and by
+    models.get_connection so both open the database the same way.
+    """
+    # busy_timeout makes a locked database wait instead of failing. It is
+    # set first: switching a fresh database to WAL needs a lock, and other
+    # connections may be opening it at the same time.
+    conn.execute(f"PRAGMA busy_timeout={int(busy_timeout_ms)};")
+    # WAL lets readers work while a writer commits, and with
+    # synchronous=NORMAL a commit no longer waits on several fsyncs.
+    conn.execute("PRAGMA journal_mode=WAL;")
+    conn.execute(f"PRAGMA synchronous={SQLITE_SYNCHRONOUS};")
+    conn.execute("PRAGMA temp_store=MEMORY;")
+    conn.execute("PRAGMA cache_size=-64000;")  # ~64 MB page cache
+    conn.execute("PRAGMA foreign_keys=ON;")
+    # Deleted rows are not overwritten with zeros, which keeps
+    # "DELETE FROM table" (used before every CSV reload) cheap
+    conn.execute("PRAGMA secure_delete=OFF;")
+
+# Statements that change the database and therefore need a commit
+WRITE_KEYWORDS = {"INSERT", "UPDATE", "DELETE", "CREATE", "DROP", "REPLACE"}
+
+
+def is_write_query(query):
+    """Return True if the first SQL keyword of `query` is a write."""
+    words = query.lstrip().split(None, 1)
+    return bool(words) and words[0].upper() in WRITE_KEYWORDS
+
+
 # -----------------------------------
 #  Database Manager Class
 # -----------------------------------
 class DatabaseManager:
-    def __init__(self, db_file="database.db"):
+    def __init__(self, db_file="database.db", busy_timeout_ms=DEFAULT_BUSY_TIMEOUT_MS):
         """
         Simple wrapper around sqlite3 to manage the database connection.
+        busy_timeout_ms is how long a statement waits on a locked database.
         """
         self.db_file = db_file
-        self.conn = sqlite3.connect(self.db_file)
+        # Larger statement cache so repeated queries skip re-parsing; the
+        # timeout also covers the PRAGMAs run below
+        self.conn = sqlite3.connect(
+            self.db_file, timeout=busy_timeout_ms / 1000, cached_statements=512
+        )
         self.cursor = self.conn.cursor()
+        # How many `with db.transaction():` blocks are currently open
+        self._tx_depth = 0
+
+        apply_pragmas(self.conn, busy_timeout_ms)
 
-    def execute(self, query, params=None, fetchone=False, fetchall=False):
+    def execute(self, query, params=None, *, fetchone=False, fetchall=False, commit=None):
         """
         Execute a SQL query with optional parameters.
-        Automatically commits changes.
+
+        commit=None (default) commits write statements (INSERT, UPDATE,
+        DELETE, ...) and never commits reads. Pass commit=True/False to
+        override. Inside `with db.transaction():` nothing is committed
+        until the block ends.
 
         Returns:
             - one row (tuple) if fetchone=True
@@ -25,15 +81,61 @@ class DatabaseManager:
         if params is None:
             params = ()
 
+        if commit is None:
+            commit = is_write_query(query)
+
         self.cursor.execute(query, params)
-        self.conn.commit()
 
+        result = None
         if fetchone:
-            return self.cursor.fetchone()
-        if fetchall:
-            return self.cursor.fetchall()
+            result = self.cursor.fetchone()
+        elif fetchall:
+            result = self.cursor.fetchall()
+
+        # Commit after reading, so statements such as INSERT ... RETURNING
+        # have finished before the transaction ends
+        if commit and self._tx_depth == 0:
+            self.conn.commit()
 
-        return None
+        return result
+
+    def executemany(self, query, seq_of_params):
+        """
+        Execute the same SQL query once for every parameter tuple in
+        seq_of_params, inside a single transaction (one commit in total).
+        Rolls back if any row fails.
+        """
+        with self.transaction():
+            self.cursor.executemany(query, seq_of_params)
+
+    # -----------------------------------
+    #  Transactions
+    # -----------------------------------
+    def transaction(self):
+        """
+        Group several statements into one transaction:
+
+            with db.transaction():
+                db.execute(...)
+                db.execute(...)
+
+        Commits once when the outermost block ends, or rolls back
+        everything if an exception is raised. Blocks can be nested.
+        """
+        return self
+
+    def __enter__(self):
+        self._tx_depth += 1
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._tx_depth -= 1
+        if self._tx_depth == 0:
+            if exc_type is None:
+                self.conn.commit()
+            else:
+                self.conn.rollback()
+        return False
 
     def close(self):
         """Close the database connection."""
@@ -61,6 +163,9 @@ class DatabaseManager:
             );
             """
         )
+        self.execute(
+            "CREATE UNIQUE INDEX IF NOT EXISTS ux_users_username ON users(username);"
+        )
 
         # Cybersecurity incidents
         self.execute(
@@ -104,6 +209,24 @@ class DatabaseManager:
             );
         """)
 
+        # Indexes on the columns dashboards filter by, so those queries
+        # do not scan the whole table
+        indexes = [
+            ("idx_ci_status", "cyber_incidents", "status"),
+            ("idx_ci_reported", "cyber_incidents", "reported_at"),
+            ("idx_it_status", "it_tickets", "status"),
+            ("idx_it_assigned", "it_tickets", "assigned_to"),
+            ("idx_dm_owner", "datasets_metadata", "owner"),
+        ]
+        for name, table, column in indexes:
+            try:
+                self.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {table}({column});")
+            except sqlite3.OperationalError as e:
+                # Table was created earlier with a different schema (e.g. by models.py)
+                print(f"[WARN] Skipped index {name}: {e}")
+
+        # Collect statistics so the query planner knows when to use them
+        self.execute("ANALYZE;")
 
         print(" All tables created (users, cyber_incidents, datasets_metadata, it_tickets).")
 
@@ -0,0 +1,97 @@
+# incident_cache.py
+#
+# Incident data for the Cybersecurity page, memoised across reruns so a
+# widget change does not re-query SQLite or rebuild the DataFrame.
+# Cached values are keyed on a version number; anything that writes
+# incidents must call bump_incidents_version() afterwards.
+
+import threading
+from typing import Optional, Tuple
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from models import SecurityIncident
+
+# Other processes (load_data.py, the CLI) can change incidents too, so
+# cached values also expire after this many seconds
+INCIDENT_CACHE_TTL = 30
+
+# datetime64[ns] values count nanoseconds
+NS_PER_MINUTE = 60_000_000_000
+
+# A handful of labels repeated on every row: stored as pandas categories
+# (integer codes), so comparisons and group-bys test each label once
+# rather than every cell
+INCIDENT_CATEGORY_COLUMNS = ("incident_type", "severity", "status")
+
+# Kept at module level rather than in st.session_state: two sessions
+# counting separately could reach the same number for different data
+_version = 0
+_version_lock = threading.Lock()
+
+
+def incidents_version() -> int:
+    """Current incidents version, passed to the cached loaders below."""
+    return _version
+
+
+def bump_incidents_version() -> None:
+    """Invalidate every cached incident value; call after create/update/delete."""
+    global _version
+    with _version_lock:
+        _version += 1
+
+
+@st.cache_data(ttl=INCIDENT_CACHE_TTL, show_spinner=False)
+def load_incident(version: int, incident_id: int) -> Optional[SecurityIncident]:
+    """One full incident (with description / analyst), or None."""
+    return SecurityIncident.get_by_id(incident_id)
+
+
+@st.cache_data(ttl=INCIDENT_CACHE_TTL, show_spinner=False)
+def load_incidents(version: int) -> pd.DataFrame:
+    """All incidents as a DataFrame, without the description / analyst
+    text (see SecurityIncident.get_all_summary); `version` only keys the cache."""
+    # The model returns the columns already split out, one list per column
+    df = pd.DataFrame(SecurityIncident.get_all_summary())
+    return df.astype({column: "category" for column in INCIDENT_CATEGORY_COLUMNS})
+
+
+@st.cache_data(ttl=INCIDENT_CACHE_TTL, show_spinner=False)
+def load_incident_insights(version: int) -> pd.DataFrame:
+    """The incidents frame plus parsed detected_at_dt / resolved_at_dt and
+    the derived resolution_minutes, for the charts."""
+    df = load_incidents(version)
+    # Timestamps are ISO 8601 (utc_timestamp()); naming the format skips
+    # pandas' per-value format guessing, and cache=True parses each
+    # distinct string once
+    df["detected_at_dt"] = pd.to_datetime(df["detected_at"], format="ISO8601", errors="coerce", cache=True)
+    df["resolved_at_dt"] = pd.to_datetime(df["resolved_at"], format="ISO8601", errors="coerce", cache=True)
+    # Minutes between the two, worked out on the int64 nanosecond values in
+    # one numpy pass instead of through a timedelta Series; NaT gives NaN
+    detected = df["detected_at_dt"].to_numpy(dtype="datetime64[ns]")
+    resolved = df["resolved_at_dt"].to_numpy(dtype="datetime64[ns]")
+    minutes = (resolved.view("i8") - detected.view("i8")) / NS_PER_MINUTE
+    minutes[np.isnat(detected) | np.isnat(resolved)] = np.nan
+    df["resolution_minutes"] = minutes
+    return df
+
+
+@st.cache_data(ttl=INCIDENT_CACHE_TTL, show_spinner=False)
+def load_incident_kpis(version: int) -> Tuple[int, int, int, int]:
+    """(total, open, resolved, phishing) incident counts, from SQL."""
+    return (
+        SecurityIncident.count(),
+        SecurityIncident.count_where(status="Open"),
+        SecurityIncident.count_where(status="Resolved"),
+        SecurityIncident.count_where(incident_type="Phishing"),
+    )
+
+
+@st.cache_data(ttl=INCIDENT_CACHE_TTL, show_spinner=False)
+def load_phishing_trend(version: int) -> pd.DataFrame:
+    """Phishing incidents per day (columns day, count), grouped by SQL."""
+    counts = SecurityIncident.phishing_by_day()
+    return pd.DataFrame({"day": list(counts), "count": list(counts.values())})
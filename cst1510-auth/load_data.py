@@ -1,6 +1,14 @@
+from __future__ import annotations
+
 import os
-import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
 from db_manager import DatabaseManager
+from models import DatasetMetadata, SecurityIncident
+
+# pandas is imported inside the functions that use it, so importing
+# this module stays cheap. The main loaders read each CSV in chunks
+# (csv_rows) straight into executemany, so they never hold the whole
+# file in memory.
 
 # -----------------------------------
 # Helper: base path for CSV files
@@ -9,6 +17,52 @@ BASE_DIR = os.path.dirname(__file__)
 DATA_DIR = os.path.join(BASE_DIR, "Data")
 
 
+# Rows read and converted per chunk by csv_rows
+CSV_CHUNK_ROWS = 10_000
+
+
+# -----------------------------------
+# Helper: read a CSV in chunks
+# -----------------------------------
+def csv_rows(path: str, columns: list, numeric: tuple = ()):
+    """
+    Yields the CSV's rows as tuples of `columns` (CSV headers, in that
+    order), reading CSV_CHUNK_ROWS rows at a time. A header missing from
+    the file, or an empty field, gives None (NULL).
+    The `numeric` columns are converted in one pd.to_numeric pass per
+    chunk; values that are not numbers become None.
+    """
+    import pandas as pd
+
+    wanted = set(columns)
+    chunks = pd.read_csv(
+        path, usecols=lambda column: column in wanted, dtype=str, chunksize=CSV_CHUNK_ROWS
+    )
+    for chunk in chunks:
+        chunk = chunk.reindex(columns=columns)
+        for column in numeric:
+            chunk[column] = pd.to_numeric(chunk[column], errors="coerce")
+        # NaN -> None, which sqlite3 stores as NULL
+        chunk = chunk.astype(object).where(chunk.notna(), None)
+        yield from chunk.itertuples(index=False, name=None)
+
+
+# -----------------------------------
+# Helper: replace a table's rows
+# -----------------------------------
+def replace_table(db: DatabaseManager, table: str, insert_sql: str, rows) -> int:
+    """
+    Deletes every row of `table` and inserts `rows` (an iterable of
+    tuples, e.g. a generator over a CSV reader) with a single executemany,
+    all in one transaction.
+    Returns the number of inserted rows.
+    """
+    with db.transaction():
+        db.execute(f"DELETE FROM {table};")
+        db.executemany(insert_sql, rows)
+    return db.cursor.rowcount
+
+
 # -----------------------------------
 # Load cyber_incidents.csv
 # -----------------------------------
@@ -20,7 +74,7 @@ def load_cyber_incidents(db: DatabaseManager) -> None:
     Mapped to:
         incident_type  <- category
         severity       <- severity
-        response_time_hours <- None (not provided in CSV)
+        response_time_hours <- response_time_hours (None if not in CSV)
         status         <- status
         reported_at    <- timestamp
     """
@@ -31,28 +85,21 @@ def load_cyber_incidents(db: DatabaseManager) -> None:
         return
 
     print(f"\n[INFO] Loading cyber incidents from: {path}")
-    df = pd.read_csv(path)
-
-    # Clear table before loading new data
-    db.execute("DELETE FROM cyber_incidents;")
-
-    inserted = 0
-    for _, row in df.iterrows():
-        incident_type = row.get("category")
-        severity = row.get("severity")
-        response_time_hours = None  # Not available in CSV
-        status = row.get("status")
-        reported_at = row.get("timestamp")
-
-        db.execute(
-            """
-            INSERT INTO cyber_incidents
-            (incident_type, severity, response_time_hours, status, reported_at)
-            VALUES (?, ?, ?, ?, ?);
-            """,
-            (incident_type, severity, response_time_hours, status, reported_at),
-        )
-        inserted += 1
+    rows = csv_rows(
+        path,
+        ["category", "severity", "response_time_hours", "status", "timestamp"],
+        numeric=("response_time_hours",),
+    )
+    inserted = replace_table(
+        db,
+        "cyber_incidents",
+        """
+        INSERT INTO cyber_incidents
+        (incident_type, severity, response_time_hours, status, reported_at)
+        VALUES (?, ?, ?, ?, ?);
+        """,
+        rows,
+    )
 
     print(f"[OK] Inserted {inserted} cyber incidents.")
 
@@ -68,7 +115,7 @@ def load_datasets_metadata(db: DatabaseManager) -> None:
     Mapped to:
         dataset_name <- name
         owner        <- uploaded_by
-        size_mb      <- None (not provided in CSV)
+        size_mb      <- size_mb (None if not in CSV)
         department   <- None (not provided in CSV)
         created_at   <- upload_date
     """
@@ -79,28 +126,22 @@ def load_datasets_metadata(db: DatabaseManager) -> None:
         return
 
     print(f"\n[INFO] Loading datasets metadata from: {path}")
-    df = pd.read_csv(path)
-
-    # Clear table before loading new data
-    db.execute("DELETE FROM datasets_metadata;")
-
-    inserted = 0
-    for _, row in df.iterrows():
-        dataset_name = row.get("name")
-        owner = row.get("uploaded_by")
-        size_mb = None       # Not available in CSV
-        department = None    # Not available in CSV
-        created_at = row.get("upload_date")
-
-        db.execute(
-            """
-            INSERT INTO datasets_metadata
-            (dataset_name, owner, size_mb, department, created_at)
-            VALUES (?, ?, ?, ?, ?);
-            """,
-            (dataset_name, owner, size_mb, department, created_at),
-        )
-        inserted += 1
+    # department is not available in the CSV, so it stays NULL
+    rows = csv_rows(
+        path,
+        ["name", "uploaded_by", "size_mb", "department", "upload_date"],
+        numeric=("size_mb",),
+    )
+    inserted = replace_table(
+        db,
+        "datasets_metadata",
+        """
+        INSERT INTO datasets_metadata
+        (dataset_name, owner, size_mb, department, created_at)
+        VALUES (?, ?, ?, ?, ?);
+        """,
+        rows,
+    )
 
     print(f"[OK] Inserted {inserted} dataset metadata rows.")
 
@@ -115,62 +156,91 @@ def load_it_tickets(db: DatabaseManager):
         return
 
     print(f"\n[INFO] Loading IT tickets from: {path}")
-    df = pd.read_csv(path)
-
-    # clear existing data
-    db.execute("DELETE FROM it_tickets;")
-
-    for _, row in df.iterrows():
-        ticket_id = row.get("ticket_id")
-        priority = row.get("priority")
-        description = row.get("description")
-        status = row.get("status")
-        assigned_to = row.get("assigned_to")
-        created_at = row.get("created_at")
-        resolution_time = row.get("resolution_time_hours")
-
-        db.execute(
-            """
-            INSERT INTO it_tickets
-            (ticket_id, priority, description, status, assigned_to, created_at, resolution_time_hours)
-            VALUES (?, ?, ?, ?, ?, ?, ?);
-            """,
-            (
-                ticket_id,
-                priority,
-                description,
-                status,
-                assigned_to,
-                created_at,
-                resolution_time,
-            ),
-        )
-
-    print(f"[OK] Inserted {len(df)} IT tickets.")
+    # CSV headers match the table columns
+    rows = csv_rows(
+        path,
+        ["ticket_id", "priority", "description", "status", "assigned_to", "created_at",
+         "resolution_time_hours"],
+        numeric=("resolution_time_hours",),
+    )
+    insert_sql = """
+        INSERT INTO it_tickets
+        (ticket_id, priority, description, status, assigned_to, created_at, resolution_time_hours)
+        VALUES (?, ?, ?, ?, ?, ?, ?);
+        """
+
+    # Once models.py has upgraded the table it reads title / created_date,
+    # so fill them from description / created_at as its migration does
+    columns = {r[1] for r in db.execute("PRAGMA table_info(it_tickets);", fetchall=True)}
+    if {"title", "created_date"} <= columns:
+        rows = (row + (row[2], row[5]) for row in rows)
+        insert_sql = """
+        INSERT INTO it_tickets
+        (ticket_id, priority, description, status, assigned_to, created_at, resolution_time_hours,
+         title, created_date)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?);
+        """
+
+    inserted = replace_table(db, "it_tickets", insert_sql, rows)
+
+    print(f"[OK] Inserted {inserted} IT tickets.")
 
 
 
 # -----------------------------------
 # main()
 # -----------------------------------
-def main():
-    db = DatabaseManager("database.db")
-    print("\n[INFO] Starting CSV → SQLite data load...")
+DB_FILE = "database.db"
+
+# SQLite allows one writer at a time, so a loader may wait for another
+# loader's transaction to finish; give it longer than the default 5 s
+LOADER_BUSY_TIMEOUT_MS = 60000
 
+
+def run_loader(loader) -> None:
+    """
+    Runs one loader on its own connection (sqlite3 connections are not
+    shared between threads), closing it afterwards.
+    """
+    # The longer timeout applies from the first statement, including the
+    # switch to WAL that the loaders may race on with a fresh database
+    db = DatabaseManager(DB_FILE, busy_timeout_ms=LOADER_BUSY_TIMEOUT_MS)
     try:
-        load_cyber_incidents(db)
-        load_datasets_metadata(db)
-        load_it_tickets(db)
-        print("\n All CSV data loaded successfully into SQLite!")
+        loader(db)
     finally:
         db.close()
-        print("[INFO] Database connection closed.")
+
+
+def main():
+    print("\n[INFO] Starting CSV → SQLite data load...")
+
+    # The three tables are independent, so their CSVs are read in parallel
+    loaders = (load_cyber_incidents, load_datasets_metadata, load_it_tickets)
+    with ThreadPoolExecutor(max_workers=len(loaders)) as pool:
+        futures = [pool.submit(run_loader, loader) for loader in loaders]
+        for future in futures:
+            future.result()
+
+    print("\n All CSV data loaded successfully into SQLite!")
+    print("[INFO] Database connections closed.")
 
 
 if __name__ == "__main__":
     main()
 
 
+# -----------------------------------
+# cyber_incidents CSV layout
+# -----------------------------------
+# Text column -> default used when the CSV has no such column (or a blank cell)
+INCIDENT_DEFAULTS = {
+    "incident_type": "Other",
+    "severity": "Low",
+    "description": "Imported from CSV",
+}
+INCIDENT_CSV_COLUMNS = [*INCIDENT_DEFAULTS, "analyst"]
+
+
 def load_cyber_incidents_from_csv(csv_path: str = "Data/cyber_incidents.csv") -> int:
     """
     Loads cyber incidents into SQLite from CSV ONLY if table is empty.
@@ -181,21 +251,53 @@ def load_cyber_incidents_from_csv(csv_path: str = "Data/cyber_incidents.csv") ->
     if SecurityIncident.count() > 0:
         return 0
 
-    df = pd.read_csv(csv_path)
+    import pandas as pd
 
-    inserted = 0
-    
-    for _, r in df.iterrows():
-        incident_type = str(r.get("incident_type", "Other"))
-        severity = str(r.get("severity", "Low"))
-        description = str(r.get("description", "Imported from CSV"))
-        analyst = r.get("analyst", None)
+    df = pd.read_csv(csv_path, usecols=lambda column: column in INCIDENT_CSV_COLUMNS)
 
-       
-        SecurityIncident.create(incident_type, severity, description, analyst)
-        inserted += 1
+    # Missing CSV columns fall back to a default for every row
+    data = df.reindex(columns=INCIDENT_CSV_COLUMNS).fillna(INCIDENT_DEFAULTS)
+    data[list(INCIDENT_DEFAULTS)] = data[list(INCIDENT_DEFAULTS)].astype(str)
+    data["analyst"] = data["analyst"].astype(object).where(data["analyst"].notna(), None)
 
-    return inserted
+    # Rows are streamed into a single executemany transaction
+    return SecurityIncident.create_many(data.itertuples(index=False, name=None))
+
+
+# -----------------------------------
+# datasets_metadata CSV layout
+# -----------------------------------
+# Target column -> default used when the CSV has no such column
+DATASET_DEFAULTS = {
+    "dataset_name": "Unnamed Dataset",
+    "source": "Unknown",
+    "owner": "Unknown",
+    "rows": 0,
+    "size_mb": 0.0,
+    "sensitivity": "Low",
+    "status": "Active",
+}
+
+# Alternative CSV header -> target column, in order of preference
+DATASET_ALIASES = {
+    "name": "dataset_name",
+    "department": "source",
+    "steward": "owner",
+    "row_count": "rows",
+    "size": "size_mb",
+    "sizeMB": "size_mb",
+    "classification": "sensitivity",
+}
+
+DATASET_TEXT_COLUMNS = ["dataset_name", "source", "owner", "sensitivity", "status"]
+
+# Only these headers are parsed; text columns are read as strings
+DATASET_CSV_COLUMNS = frozenset(DATASET_DEFAULTS) | frozenset(DATASET_ALIASES)
+DATASET_CSV_DTYPES = {
+    column: "string"
+    for column in DATASET_CSV_COLUMNS
+    if DATASET_ALIASES.get(column, column) in DATASET_TEXT_COLUMNS
+}
 
 
 def load_datasets_metadata_from_csv(csv_path: str = "Data/datasets_metadata.csv") -> int:
@@ -208,20 +310,25 @@ def load_datasets_metadata_from_csv(csv_path: str = "Data/datasets_metadata.csv"
     if DatasetMetadata.count() > 0:
         return 0
 
-    df = pd.read_csv(csv_path)
-    inserted = 0
+    import pandas as pd
+
+    df = pd.read_csv(
+        csv_path,
+        usecols=lambda column: column in DATASET_CSV_COLUMNS,
+        dtype=DATASET_CSV_DTYPES,
+    )
+
+    # An alias is only used when neither the target column nor an
+    # earlier alias for it is present
+    renames = {}
+    for alias, target in DATASET_ALIASES.items():
+        if alias in df.columns and target not in df.columns and target not in renames.values():
+            renames[alias] = target
 
-    for _, r in df.iterrows():
-       
-        dataset_name = str(r.get("dataset_name", r.get("name", "Unnamed Dataset")))
-        source = str(r.get("source", r.get("department", "Unknown")))
-        owner = str(r.get("owner", r.get("steward", "Unknown")))
-        rows = int(r.get("rows", r.get("row_count", 0)))
-        size_mb = float(r.get("size_mb", r.get("size", r.get("sizeMB", 0.0))))
-        sensitivity = str(r.get("sensitivity", r.get("classification", "Low")))
-        status = str(r.get("status", "Active"))
+    data = df.rename(columns=renames).reindex(columns=list(DATASET_DEFAULTS)).fillna(DATASET_DEFAULTS)
 
-        DatasetMetadata.create(dataset_name, source, owner, rows, size_mb, sensitivity, status=status)
-        inserted += 1
+    # Coerce the numeric columns at once instead of per row
+    data["rows"] = pd.to_numeric(data["rows"], errors="coerce").fillna(0).astype("int64")
+    data["size_mb"] = pd.to_numeric(data["size_mb"], errors="coerce").fillna(0.0).astype("float64")
 
-    return inserted
\ No newline at end of file
+    return DatasetMetadata.create_many(data.itertuples(index=False, name=None))
@@ -1,15 +1,72 @@
 import bcrypt
 import os
+import string
+import time
+from db_manager import DatabaseManager
+from password_hashing import check_password
 
 # -----------------------------
 #  Global constant
 # -----------------------------
+DB_FILE = "database.db"
+
+# Week 7 flat file, still read for accounts that migrate_users.py
+# has not copied into SQLite yet
 USER_DATA_FILE = "users.txt"
 
+# Target time for hashing one password; the bcrypt cost factor is
+# calibrated once to the highest value that stays under it
+BCRYPT_TARGET_SECONDS = 0.25
+BCRYPT_MIN_ROUNDS = 10
+BCRYPT_MAX_ROUNDS = 14
+
+_BCRYPT_ROUNDS = None
+
+# users.txt contents as {username: hash}, read on first lookup
+_LEGACY_USERS = None
+
+# Character classes a valid password must draw from
+UPPERCASE = frozenset(string.ascii_uppercase)
+LOWERCASE = frozenset(string.ascii_lowercase)
+DIGITS = frozenset(string.digits)
+
+_db = None
+
 
 # -----------------------------
 #  Core security functions
 # -----------------------------
+def calibrate_bcrypt_rounds():
+    """
+    Measures bcrypt on this machine and picks the cost factor to use.
+
+    Tries costs from BCRYPT_MIN_ROUNDS upwards and stops at the first one
+    slower than BCRYPT_TARGET_SECONDS (each step doubles the time).
+
+    Returns:
+        int: The highest cost within the target, never below BCRYPT_MIN_ROUNDS.
+    """
+    rounds = BCRYPT_MIN_ROUNDS
+    for candidate in range(BCRYPT_MIN_ROUNDS, BCRYPT_MAX_ROUNDS + 1):
+        start = time.perf_counter()
+        bcrypt.hashpw(b"calibration", bcrypt.gensalt(rounds=candidate))
+        if time.perf_counter() - start > BCRYPT_TARGET_SECONDS:
+            break
+        rounds = candidate
+    return rounds
+
+
+def get_bcrypt_rounds():
+    """
+    Returns the calibrated bcrypt cost, running the calibration only
+    on the first call (so importing this module stays fast).
+    """
+    global _BCRYPT_ROUNDS
+    if _BCRYPT_ROUNDS is None:
+        _BCRYPT_ROUNDS = calibrate_bcrypt_rounds()
+    return _BCRYPT_ROUNDS
+
+
 def hash_password(plain_text_password):
     """
     Hashes a password using bcrypt with automatic salt generation.
@@ -23,8 +80,8 @@ def hash_password(plain_text_password):
     # Encode the password to bytes
     password_bytes = plain_text_password.encode("utf-8")
 
-    # Generate salt
-    salt = bcrypt.gensalt()
+    # Generate salt with the calibrated cost factor
+    salt = bcrypt.gensalt(rounds=get_bcrypt_rounds())
 
     # Hash the password
     hashed = bcrypt.hashpw(password_bytes, salt)
@@ -35,59 +92,115 @@ def hash_password(plain_text_password):
 
 def verify_password(plain_text_password, hashed_password):
     """
-    Verifies a plaintext password against a stored bcrypt hash.
+    Verifies a plaintext password against a stored bcrypt or Argon2id hash.
 
     Returns:
         bool: True if the password matches, False otherwise.
     """
-    password_bytes = plain_text_password.encode("utf-8")
-    hashed_bytes = hashed_password.encode("utf-8")
-    return bcrypt.checkpw(password_bytes, hashed_bytes)
+    return check_password(hashed_password, plain_text_password)
 
 
 # -----------------------------
 #  User management functions
 # -----------------------------
-def user_exists(username):
+def get_db():
+    """
+    Returns the shared database connection, creating the tables on first use.
+    """
+    global _db
+    if _db is None:
+        _db = DatabaseManager(DB_FILE)
+        _db.create_tables()
+    return _db
+
+
+def load_legacy_users():
     """
-    Checks if a username already exists in users.txt
+    Reads users.txt once into a dict; later calls reuse it. Nothing
+    writes to the file any more, so the dict cannot go stale.
 
     Returns:
-        bool
+        dict: {username: stored_hash}, empty if the file does not exist.
     """
-    # If the file does not exist yet, there are no users
-    if not os.path.exists(USER_DATA_FILE):
-        return False
+    global _LEGACY_USERS
+    if _LEGACY_USERS is None:
+        users = {}
+        # If the file does not exist yet, there are no users
+        if os.path.exists(USER_DATA_FILE):
+            with open(USER_DATA_FILE, "r", encoding="utf-8") as f:
+                for line in f:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    stored_username, stored_hash = line.split(",", 1)
+                    # Keep the first entry, as the old linear scan did
+                    users.setdefault(stored_username, stored_hash)
+        _LEGACY_USERS = users
+    return _LEGACY_USERS
+
+
+def find_legacy_hash(username):
+    """
+    Looks up a username in users.txt (accounts not migrated yet).
 
-    with open(USER_DATA_FILE, "r", encoding="utf-8") as f:
-        for line in f:
-            line = line.strip()
-            if not line:
-                continue
-            stored_username = line.split(",")[0]
-            if stored_username == username:
-                return True
+    Returns:
+        str | None: The stored hash, or None if the user is not in the file.
+    """
+    return load_legacy_users().get(username)
 
-    return False
+
+def find_password_hash(username):
+    """
+    Looks up the stored hash for a username: an indexed SQLite lookup
+    first, then users.txt for accounts that have not been migrated.
+
+    Returns:
+        str | None: The stored hash, or None if the user does not exist.
+    """
+    row = get_db().execute(
+        "SELECT password_hash FROM users WHERE username = ?;",
+        (username,),
+        fetchone=True,
+    )
+    if row:
+        return row[0]
+    return find_legacy_hash(username)
+
+
+def user_exists(username):
+    """
+    Checks if a username already exists (SQLite or users.txt)
+
+    Returns:
+        bool
+    """
+    return find_password_hash(username) is not None
 
 
 def register_user(username, password):
     """
-    Registers a new user by hashing password and storing credentials.
-    Format in file: username,hashed_password
+    Registers a new user by hashing password and storing credentials
+    in the SQLite users table. The existence check and the insert are a
+    single statement, so two registrations cannot race.
 
     Returns:
         bool: True if success, False if username exists
     """
-    if user_exists(username):
+    if find_legacy_hash(username) is not None:
         return False
 
     hashed = hash_password(password)
 
-    with open(USER_DATA_FILE, "a", encoding="utf-8") as f:
-        f.write(f"{username},{hashed}\n")
-
-    return True
+    row = get_db().execute(
+        """
+        INSERT INTO users (username, password_hash) VALUES (?, ?)
+        ON CONFLICT(username) DO NOTHING
+        RETURNING id;
+        """,
+        (username, hashed),
+        fetchone=True,
+    )
+    return row is not None
 
 
 def login_user(username, password):
@@ -97,29 +210,19 @@ def login_user(username, password):
     Returns:
         bool
     """
-    if not os.path.exists(USER_DATA_FILE):
-        print("Error: No users are registered yet.")
-        return False
-
-    with open(USER_DATA_FILE, "r", encoding="utf-8") as f:
-        for line in f:
-            line = line.strip()
-            if not line:
-                continue
+    stored_hash = find_password_hash(username)
 
-            stored_username, stored_hash = line.split(",", 1)
+    if stored_hash is None:
+        # Username not found
+        print("Error: Username not found.")
+        return False
 
-            if stored_username == username:
-                # Found the username: verify password
-                if verify_password(password, stored_hash):
-                    print(f"Success: Welcome, {username}!")
-                    return True
-                else:
-                    print("Error: Invalid password.")
-                    return False
+    # Found the username: verify password
+    if verify_password(password, stored_hash):
+        print(f"Success: Welcome, {username}!")
+        return True
 
-    # Username not found
-    print("Error: Username not found.")
+    print("Error: Invalid password.")
     return False
 
 
@@ -150,11 +253,11 @@ def validate_password(password):
     if len(password) < 6 or len(password) > 50:
         return False, "Password must be between 6 and 50 characters."
 
-    has_upper = any(c.isupper() for c in password)
-    has_lower = any(c.islower() for c in password)
-    has_digit = any(c.isdigit() for c in password)
-
-    if not (has_upper and has_lower and has_digit):
+    if (
+        UPPERCASE.isdisjoint(password)
+        or LOWERCASE.isdisjoint(password)
+        or DIGITS.isdisjoint(password)
+    ):
         return False, "Password must include uppercase, lowercase and a digit."
 
     return True, ""
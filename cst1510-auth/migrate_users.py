@@ -7,28 +7,33 @@ def migrate_users():
 
     try:
         with open("users.txt", "r", encoding="utf-8") as f:
+            rows = []
             for line in f:
                 line = line.strip()
-                if not line:
+                # Skip blank and malformed lines (no "username,hash")
+                if "," not in line:
                     continue
-                username, password_hash = line.split(",")
-
-                # Insert into SQLite
-                db.execute(
-                    """
-                    INSERT INTO users (username, password_hash)
-                    VALUES (?, ?)
-                    """,
-                    (username, password_hash)
-                )
-                print(f"Inserted user → {username}")
+                rows.append(tuple(line.split(",", 1)))
+
+        # Insert into SQLite: one executemany, one transaction. Usernames
+        # already in the table are skipped, so the script can be re-run.
+        db.executemany(
+            """
+            INSERT OR IGNORE INTO users (username, password_hash)
+            VALUES (?, ?)
+            """,
+            rows
+        )
+        inserted = db.cursor.rowcount
+        print(f"Inserted {inserted} users ({len(rows) - inserted} already migrated).")
 
         print("Migration completed successfully!")
 
     except FileNotFoundError:
         print("ERROR: users.txt not found. Run Week 7 first.")
 
-    db.close()
+    finally:
+        db.close()
 
 
 if __name__ == "__main__":
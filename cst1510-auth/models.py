@@ -1,49 +1,157 @@
 # models.py
 
 from __future__ import annotations
+from contextlib import contextmanager
 from dataclasses import dataclass
-from datetime import datetime
-from typing import List, Optional
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+import atexit
 import sqlite3
+import threading
+import time
+
+from db_manager import apply_pragmas
 
 DB_PATH = "database.db"
 
+# Each thread (Streamlit runs every session in its own thread) keeps one
+# connection open and reuses it for every model call; writes are serialised
+_local = threading.local()
+_write_lock = threading.Lock()
+
+# Each table's schema only needs checking once per process; _init_db
+# runs the it_tickets upgrade when the first connection is opened.
+# Re-entrant because ensure_table setup can open that first connection
+# while already holding the lock.
+_ready_tables = set()
+_db_initialised = False
+_schema_lock = threading.RLock()
+
+
+# ---------- Timestamps ----------
+
+def utc_timestamp() -> str:
+    """Current UTC time as 'YYYY-MM-DDTHH:MM:SS' (sortable as text)."""
+    return time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime())
+
 
 # ---------- Database connection ----------
 
 def get_connection() -> sqlite3.Connection:
-    """Return a SQLite connection with Row factory."""
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row
+    """
+    Return this thread's SQLite connection (plain tuple rows), opening it
+    and applying the PRAGMAs on first use. The first connection in the
+    process also runs _init_db. Callers must not close it; it is closed
+    when its thread ends, or at exit for the main thread.
+    """
+    conn = getattr(_local, "conn", None)
+    if conn is None:
+        conn = sqlite3.connect(DB_PATH, check_same_thread=False, cached_statements=256)
+        apply_pragmas(conn)
+        _init_db(conn)
+        _local.conn = conn
     return conn
 
 
+def close_connection() -> None:
+    """Close this thread's connection, if it has one."""
+    conn = getattr(_local, "conn", None)
+    if conn is not None:
+        conn.close()
+        _local.conn = None
+
+
+atexit.register(close_connection)
+
+
+@contextmanager
+def transaction() -> Iterator[sqlite3.Connection]:
+    """
+    Group several model writes into one transaction on this thread's
+    connection:
+
+        with transaction():
+            SecurityIncident.update(...)
+            DatasetMetadata.delete(...)
+
+    Commits once when the outermost block ends (one fsync with WAL), or
+    rolls everything back if an exception is raised. Blocks can be
+    nested; every model write runs inside one.
+
+    Lock order is _schema_lock, then _write_lock. Inside a block the
+    write lock is already held, so _ensure_once does not take
+    _schema_lock there (see below).
+    """
+    conn = get_connection()
+    if getattr(_local, "in_transaction", False):
+        yield conn
+        return
+
+    with _write_lock, conn:
+        _local.in_transaction = True
+        try:
+            yield conn
+        finally:
+            _local.in_transaction = False
+
+
+def _ensure_once(table: str, setup) -> None:
+    """
+    Run `setup` (create / migrate `table`) the first time it is asked
+    for in this process; later calls return immediately.
+    """
+    if table in _ready_tables:
+        return
+
+    if getattr(_local, "in_transaction", False):
+        # This thread holds _write_lock; taking _schema_lock now would
+        # invert the lock order. setup() is idempotent (CREATE ... IF NOT
+        # EXISTS) and joins the open transaction, so it runs directly. The
+        # table is not marked ready: the transaction may still roll back.
+        setup()
+        return
+
+    with _schema_lock:
+        if table in _ready_tables:
+            return
+        setup()
+        _ready_tables.add(table)
+
+
+def _init_db(conn: sqlite3.Connection) -> None:
+    """One-time schema setup for this process, run on the first connection."""
+    global _db_initialised
+    if _db_initialised:
+        return
+
+    with _schema_lock:
+        if _db_initialised:
+            return
+        _migrate_it_tickets_schema(conn)
+        _db_initialised = True
+
+
 def ensure_it_tickets_table() -> None:
     """
     Ensure that the it_tickets table exists AND that it has the columns
     title and created_date, even if the database is from the old schema
     (with description / created_at).
+    Opening the first connection does this (see _init_db), so ITTicket
+    methods never need to call it.
     """
-    conn = get_connection()
-    cur = conn.cursor()
-    try:
+    get_connection()
+
+
+def _migrate_it_tickets_schema(conn: sqlite3.Connection) -> None:
+    """Create / upgrade the it_tickets table (see ensure_it_tickets_table)."""
+    with _write_lock, conn:
+        cur = conn.cursor()
         # If the table does not exist at all, create it with the new schema
-        cur.execute(
-            """
-            CREATE TABLE IF NOT EXISTS it_tickets (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                title TEXT,
-                priority TEXT,
-                status TEXT,
-                created_date TEXT
-            )
-            """
-        )
+        cur.execute(SQL_CREATE_TICKETS)
 
-        # Check which columns the table already has
+        # Read the existing columns once; the ALTERs below only add
+        # title / created_date, so this set stays valid afterwards
         cur.execute("PRAGMA table_info(it_tickets)")
-        rows = cur.fetchall()
-        col_names = [r["name"] if isinstance(r, sqlite3.Row) else r[1] for r in rows]
+        col_names = {r[1] for r in cur.fetchall()}
 
         # If the 'title' column is missing, add it
         if "title" not in col_names:
@@ -55,9 +163,6 @@ def ensure_it_tickets_table() -> None:
 
         # Optional: populate the new columns from the old ones
         # so that old tickets still look correct
-        cur.execute("PRAGMA table_info(it_tickets)")
-        col_names = [r["name"] if isinstance(r, sqlite3.Row) else r[1] for r in cur.fetchall()]
-
         if "description" in col_names:
             cur.execute(
                 """
@@ -78,9 +183,178 @@ def ensure_it_tickets_table() -> None:
                 """
             )
 
-        conn.commit()
-    finally:
-        conn.close()
+        cur.execute(SQL_INDEX_TICKETS)
+        cur.execute(SQL_INDEX_TICKETS_PRIORITY)
+
+
+# ---------- SQL statements ----------
+# Kept as module constants so every call passes the same string and
+# hits the connection's prepared-statement cache.
+
+SQL_CREATE_TICKETS = """
+    CREATE TABLE IF NOT EXISTS it_tickets (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        title TEXT,
+        priority TEXT,
+        status TEXT,
+        created_date TEXT
+    )
+"""
+# Ticket lists are filtered and counted by status and priority; the
+# composite index also serves status on its own
+SQL_INDEX_TICKETS = (
+    "CREATE INDEX IF NOT EXISTS idx_tickets_status_priority ON it_tickets(status, priority)"
+)
+SQL_INDEX_TICKETS_PRIORITY = (
+    "CREATE INDEX IF NOT EXISTS idx_tickets_priority ON it_tickets(priority)"
+)
+
+# Only the columns ITTicket needs, in field order, so legacy columns are
+# never read and rows map positionally
+TICKET_COLUMNS = "id, title, priority, status, created_date"
+SQL_LIST_TICKETS = f"SELECT {TICKET_COLUMNS} FROM it_tickets"
+SQL_GET_TICKET = f"SELECT {TICKET_COLUMNS} FROM it_tickets WHERE id = ?"
+SQL_INSERT_TICKET = (
+    "INSERT INTO it_tickets (title, priority, status, created_date) VALUES (?, ?, ?, ?)"
+)
+SQL_UPDATE_TICKET = "UPDATE it_tickets SET priority = ?, status = ? WHERE id = ?"
+SQL_DELETE_TICKET = "DELETE FROM it_tickets WHERE id = ?"
+SQL_COUNT_TICKETS = "SELECT COUNT(*) FROM it_tickets"
+SQL_TICKET_IDS = "SELECT id FROM it_tickets ORDER BY id"
+SQL_TICKET_PAGE = f"SELECT {TICKET_COLUMNS} FROM it_tickets ORDER BY id DESC LIMIT ? OFFSET ?"
+SQL_TICKET_STATUS_COUNTS = (
+    "SELECT status, COUNT(*) FROM it_tickets GROUP BY status ORDER BY COUNT(*) DESC"
+)
+SQL_TICKET_PRIORITY_COUNTS = (
+    "SELECT priority, COUNT(*) FROM it_tickets GROUP BY priority ORDER BY COUNT(*) DESC"
+)
+SQL_DISTINCT_TICKET_STATUSES = (
+    "SELECT DISTINCT status FROM it_tickets WHERE status IS NOT NULL ORDER BY status"
+)
+SQL_DISTINCT_TICKET_PRIORITIES = (
+    "SELECT DISTINCT priority FROM it_tickets WHERE priority IS NOT NULL ORDER BY priority"
+)
+
+SQL_CREATE_INCIDENTS = """
+    CREATE TABLE IF NOT EXISTS cyber_incidents (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        incident_type TEXT NOT NULL,
+        severity TEXT NOT NULL,
+        description TEXT NOT NULL,
+        status TEXT NOT NULL DEFAULT 'Open',
+        detected_at TEXT NOT NULL,
+        resolved_at TEXT,
+        analyst TEXT
+    );
+"""
+SQL_INDEX_INCIDENTS = (
+    "CREATE INDEX IF NOT EXISTS idx_incidents_status_severity ON cyber_incidents(status, severity)"
+)
+# Column order matches SecurityIncident's fields, so rows map positionally
+INCIDENT_COLUMNS = (
+    "id, incident_type, severity, description, status, detected_at, resolved_at, analyst"
+)
+SQL_LIST_INCIDENTS = f"SELECT {INCIDENT_COLUMNS} FROM cyber_incidents ORDER BY id DESC"
+SQL_GET_INCIDENT = f"SELECT {INCIDENT_COLUMNS} FROM cyber_incidents WHERE id = ?"
+# Everything but the free-text description / analyst, for tables and charts
+INCIDENT_SUMMARY_COLUMNS = ("id", "incident_type", "severity", "status", "detected_at", "resolved_at")
+# Same NULL / empty-string defaults as SecurityIncident.from_row
+SQL_LIST_INCIDENT_SUMMARIES = """
+    SELECT id,
+           COALESCE(NULLIF(incident_type, ''), 'Other'),
+           COALESCE(NULLIF(severity, ''), 'Low'),
+           COALESCE(NULLIF(status, ''), 'Open'),
+           COALESCE(detected_at, ''),
+           resolved_at
+    FROM cyber_incidents
+    ORDER BY id DESC
+"""
+SQL_COUNT_INCIDENTS = "SELECT COUNT(*) FROM cyber_incidents"
+SQL_PHISHING_BY_DAY = """
+    SELECT date(detected_at) AS day, COUNT(*)
+    FROM cyber_incidents
+    WHERE incident_type = 'Phishing' AND day IS NOT NULL
+    GROUP BY day
+    ORDER BY day
+"""
+# Columns SecurityIncident.count_where() may filter on (names are put in the SQL)
+INCIDENT_FILTER_COLUMNS = frozenset(c.strip() for c in INCIDENT_COLUMNS.split(","))
+SQL_INSERT_INCIDENT = """
+    INSERT INTO cyber_incidents (incident_type, severity, description, status, detected_at, resolved_at, analyst)
+    VALUES (?, ?, ?, 'Open', ?, NULL, ?)
+"""
+# resolved_at is stamped the first time an incident becomes Resolved,
+# kept while it stays Resolved, and cleared when it is reopened
+SQL_UPDATE_INCIDENT = """
+    UPDATE cyber_incidents
+    SET incident_type = :incident_type,
+        severity = :severity,
+        description = :description,
+        status = :status,
+        analyst = :analyst,
+        resolved_at = CASE
+            WHEN :status <> 'Resolved' THEN NULL
+            WHEN resolved_at IS NULL OR resolved_at = '' THEN :now
+            ELSE resolved_at
+        END
+    WHERE id = :id
+"""
+SQL_DELETE_INCIDENT = "DELETE FROM cyber_incidents WHERE id = ?"
+
+SQL_CREATE_DATASETS = """
+    CREATE TABLE IF NOT EXISTS datasets_metadata (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        dataset_name TEXT NOT NULL,
+        source TEXT NOT NULL,
+        owner TEXT NOT NULL,
+        rows INTEGER NOT NULL,
+        size_mb REAL NOT NULL,
+        sensitivity TEXT NOT NULL,
+        last_updated TEXT NOT NULL,
+        status TEXT NOT NULL DEFAULT 'Active'
+    );
+"""
+SQL_INDEX_DATASETS = (
+    "CREATE INDEX IF NOT EXISTS idx_datasets_status_sensitivity "
+    "ON datasets_metadata(status, sensitivity)"
+)
+# Column order matches DatasetMetadata's fields, so rows map positionally
+DATASET_COLUMNS = (
+    "id, dataset_name, source, owner, rows, size_mb, sensitivity, last_updated, status"
+)
+SQL_LIST_DATASETS = f"SELECT {DATASET_COLUMNS} FROM datasets_metadata ORDER BY id DESC"
+SQL_GET_DATASET = f"SELECT {DATASET_COLUMNS} FROM datasets_metadata WHERE id = ?"
+SQL_COUNT_DATASETS = "SELECT COUNT(*) FROM datasets_metadata"
+SQL_DATASET_SOURCE_COUNTS = (
+    "SELECT source, COUNT(*) FROM datasets_metadata GROUP BY source ORDER BY COUNT(*) DESC"
+)
+# Sensitivity labels (lower case) counted as high sensitivity
+SENSITIVE_LEVELS = ("high", "confidential", "pii", "restricted")
+SQL_DATASET_SUMMARY = f"""
+    SELECT COUNT(*),
+           TOTAL(size_mb),
+           COUNT(*) FILTER (WHERE status = 'Active'),
+           COUNT(*) FILTER (WHERE lower(sensitivity) IN ({", ".join("?" * len(SENSITIVE_LEVELS))}))
+    FROM datasets_metadata
+"""
+SQL_INSERT_DATASET = """
+    INSERT INTO datasets_metadata
+    (dataset_name, source, owner, rows, size_mb, sensitivity, last_updated, status)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+"""
+SQL_UPDATE_DATASET = """
+    UPDATE datasets_metadata
+    SET dataset_name = ?,
+        source = ?,
+        owner = ?,
+        rows = ?,
+        size_mb = ?,
+        sensitivity = ?,
+        last_updated = ?,
+        status = ?
+    WHERE id = ?
+"""
+SQL_DELETE_DATASET = "DELETE FROM datasets_metadata WHERE id = ?"
 
 
 # ---------- Entity classes ----------
@@ -105,83 +379,91 @@ class ITTicket:
     # ---------- Factory / query methods ----------
 
     @classmethod
-    def from_row(cls, row: sqlite3.Row) -> "ITTicket":
-        """Create an ITTicket instance from a SQLite row (old or new schema)."""
-        keys = row.keys() if hasattr(row, "keys") else []
-
-        def get(col: str, default=None):
-            return row[col] if col in keys else default
-
-        ticket_id = get("id") or get("ticket_id")
-
-        title = (
-            get("title")
-            or get("description")
-            or f"Ticket {ticket_id} problem description"
-        )
-
-        created = (
-            get("created_date")
-            or get("created_at")
-            or get("created")
-            or datetime.utcnow().isoformat(timespec="seconds")
-        )
-
-        priority = get("priority", "Unknown")
-        status = get("status", "Unknown")
-
+    def from_row(cls, row: Sequence) -> "ITTicket":
+        """
+        Create an ITTicket from an (id, title, priority, status,
+        created_date) row, as selected by TICKET_COLUMNS.
+        """
+        ticket_id, title, priority, status, created = row
         return cls(
-            id=get("id"),
-            title=title,
+            id=ticket_id,
+            title=title or f"Ticket {ticket_id} problem description",
             priority=priority,
             status=status,
-            created_date=created,
+            created_date=created or utc_timestamp(),
         )
 
     @classmethod
-    def get_all(cls) -> List["ITTicket"]:
-        """Return all IT tickets from the database."""
-        ensure_it_tickets_table()
-        conn = get_connection()
+    def iter_all(cls) -> Iterator["ITTicket"]:
+        """
+        Yield IT tickets one at a time as SQLite returns them, so callers
+        that only need the first few never build the rest.
+        """
+        cur = get_connection().execute(SQL_LIST_TICKETS)
         try:
-            rows = conn.execute("SELECT * FROM it_tickets").fetchall()
-            return [cls.from_row(r) for r in rows]
+            for row in cur:
+                yield cls.from_row(row)
         finally:
-            conn.close()
+            cur.close()
+
+    @classmethod
+    def get_all(cls) -> List["ITTicket"]:
+        """Return all IT tickets from the database."""
+        return list(cls.iter_all())
+
+    @classmethod
+    def ids(cls) -> List[int]:
+        """Return every ticket id, ascending, without loading the rows."""
+        return [ticket_id for (ticket_id,) in get_connection().execute(SQL_TICKET_IDS)]
+
+    @classmethod
+    def get_page(cls, offset: int, limit: int = 100) -> List["ITTicket"]:
+        """Return `limit` tickets, newest first, skipping the first `offset`."""
+        rows = get_connection().execute(SQL_TICKET_PAGE, (limit, offset)).fetchall()
+        return [cls.from_row(r) for r in rows]
 
     @classmethod
     def get_by_id(cls, ticket_id: int) -> Optional["ITTicket"]:
         """Return a single ticket by id."""
-        ensure_it_tickets_table()
-        conn = get_connection()
-        try:
-            row = conn.execute(
-                "SELECT * FROM it_tickets WHERE id = ?", (ticket_id,)
-            ).fetchone()
-            return cls.from_row(row) if row else None
-        finally:
-            conn.close()
+        row = get_connection().execute(SQL_GET_TICKET, (ticket_id,)).fetchone()
+        return cls.from_row(row) if row else None
+
+    # ---------- Aggregates ----------
+
+    @classmethod
+    def count(cls) -> int:
+        """Return the number of tickets."""
+        (n,) = get_connection().execute(SQL_COUNT_TICKETS).fetchone()
+        return int(n)
+
+    @classmethod
+    def status_counts(cls) -> Dict[str, int]:
+        """Return {status: number of tickets}, most common first."""
+        return dict(get_connection().execute(SQL_TICKET_STATUS_COUNTS).fetchall())
+
+    @classmethod
+    def priority_counts(cls) -> Dict[str, int]:
+        """Return {priority: number of tickets}, most common first."""
+        return dict(get_connection().execute(SQL_TICKET_PRIORITY_COUNTS).fetchall())
+
+    @classmethod
+    def distinct_statuses(cls) -> List[str]:
+        """Return the statuses in use, sorted."""
+        return [status for (status,) in get_connection().execute(SQL_DISTINCT_TICKET_STATUSES)]
+
+    @classmethod
+    def distinct_priorities(cls) -> List[str]:
+        """Return the priorities in use, sorted."""
+        return [priority for (priority,) in get_connection().execute(SQL_DISTINCT_TICKET_PRIORITIES)]
 
     @classmethod
     def create(cls, title: str, priority: str, status: str) -> "ITTicket":
         """Create a new ticket and store it in the database."""
-        ensure_it_tickets_table()
-        created = datetime.utcnow().isoformat(timespec="seconds")
+        created = utc_timestamp()
 
-        conn = get_connection()
-        try:
-            cur = conn.cursor()
-            cur.execute(
-                """
-                INSERT INTO it_tickets (title, priority, status, created_date)
-                VALUES (?, ?, ?, ?)
-                """,
-                (title, priority, status, created),
-            )
-            conn.commit()
+        with transaction() as conn:
+            cur = conn.execute(SQL_INSERT_TICKET, (title, priority, status, created))
             new_id = cur.lastrowid
-        finally:
-            conn.close()
 
         return cls(
             id=new_id,
@@ -191,6 +473,37 @@ class ITTicket:
             created_date=created,
         )
 
+    # ---------- Bulk write methods ----------
+
+    @classmethod
+    def create_many(cls, rows: Iterable[Tuple[str, str, str]]) -> int:
+        """
+        Insert (title, priority, status) tuples in one transaction, all
+        stamped with the same created_date. Returns the number inserted.
+        """
+        created = utc_timestamp()
+        with transaction() as conn:
+            cur = conn.executemany(
+                SQL_INSERT_TICKET,
+                ((title, priority, status, created) for title, priority, status in rows),
+            )
+        return cur.rowcount
+
+    @classmethod
+    def bulk_update(cls, changes: Iterable[Tuple[str, str, int]]) -> None:
+        """
+        Apply (priority, status, id) changes in one transaction, so N
+        tickets cost a single commit instead of N.
+        """
+        with transaction() as conn:
+            conn.executemany(SQL_UPDATE_TICKET, changes)
+
+    @classmethod
+    def bulk_delete(cls, ticket_ids: Iterable[int]) -> None:
+        """Delete the given ticket ids in one transaction."""
+        with transaction() as conn:
+            conn.executemany(SQL_DELETE_TICKET, ((ticket_id,) for ticket_id in ticket_ids))
+
     # ---------- Instance methods ----------
 
     def update(self, priority: str, status: str) -> None:
@@ -198,20 +511,7 @@ class ITTicket:
         if self.id is None:
             raise ValueError("Cannot update ticket without id.")
 
-        ensure_it_tickets_table()
-        conn = get_connection()
-        try:
-            conn.execute(
-                """
-                UPDATE it_tickets
-                SET priority = ?, status = ?
-                WHERE id = ?
-                """,
-                (priority, status, self.id),
-            )
-            conn.commit()
-        finally:
-            conn.close()
+        self.bulk_update([(priority, status, self.id)])
 
         self.priority = priority
         self.status = status
@@ -221,13 +521,7 @@ class ITTicket:
         if self.id is None:
             raise ValueError("Cannot delete ticket without id.")
 
-        ensure_it_tickets_table()
-        conn = get_connection()
-        try:
-            conn.execute("DELETE FROM it_tickets WHERE id = ?", (self.id,))
-            conn.commit()
-        finally:
-            conn.close()
+        self.bulk_delete([self.id])
 
     # ---------- Helper ----------
 
@@ -255,39 +549,27 @@ class SecurityIncident:
 
     @classmethod
     def ensure_table(cls):
-        conn = get_connection()
-        try:
-            conn.execute("""
-                CREATE TABLE IF NOT EXISTS cyber_incidents (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    incident_type TEXT NOT NULL,
-                    severity TEXT NOT NULL,
-                    description TEXT NOT NULL,
-                    status TEXT NOT NULL DEFAULT 'Open',
-                    detected_at TEXT NOT NULL,
-                    resolved_at TEXT,
-                    analyst TEXT
-                );
-            """)
-            conn.commit()
-        finally:
-            conn.close()
+        _ensure_once("cyber_incidents", cls._create_table)
 
     @classmethod
-    def _dict_row_factory(cls, cursor, row):
-        return {col[0]: row[idx] for idx, col in enumerate(cursor.description)}
+    def _create_table(cls):
+        with transaction() as conn:
+            conn.execute(SQL_CREATE_INCIDENTS)
+            conn.execute(SQL_INDEX_INCIDENTS)
 
     @staticmethod
-    def from_row(row):
+    def from_row(row: Sequence) -> "SecurityIncident":
+        # row is in INCIDENT_COLUMNS order
+        incident_id, incident_type, severity, description, status, detected_at, resolved_at, analyst = row
         return SecurityIncident(
-            id=row.get("id"),
-            incident_type=row.get("incident_type") or "Other",
-            severity=row.get("severity") or "Low",
-            description=row.get("description") or "",
-            status=row.get("status") or "Open",
-            detected_at=row.get("detected_at") or "",
-            resolved_at=row.get("resolved_at"),
-            analyst=row.get("analyst"),
+            id=incident_id,
+            incident_type=incident_type or "Other",
+            severity=severity or "Low",
+            description=description or "",
+            status=status or "Open",
+            detected_at=detected_at or "",
+            resolved_at=resolved_at,
+            analyst=analyst,
         )
 
 
@@ -295,54 +577,79 @@ class SecurityIncident:
     @classmethod
     def get_all(cls) -> List["SecurityIncident"]:
         cls.ensure_table()
-        conn = get_connection()
-        try:
-            conn.row_factory = cls._dict_row_factory
-            rows = conn.execute("SELECT * FROM cyber_incidents ORDER BY id DESC").fetchall()
-            return [cls.from_row(r) for r in rows]
-        finally:
-            conn.close()
+        rows = get_connection().execute(SQL_LIST_INCIDENTS).fetchall()
+        return [cls.from_row(r) for r in rows]
+
+    @classmethod
+    def phishing_by_day(cls) -> Dict[str, int]:
+        """Return {'YYYY-MM-DD': number of phishing incidents detected}, oldest day first."""
+        cls.ensure_table()
+        return dict(get_connection().execute(SQL_PHISHING_BY_DAY).fetchall())
+
+    @classmethod
+    def get_all_summary(cls) -> Dict[str, list]:
+        """
+        Return every incident (newest first) as {column: values}, for the
+        INCIDENT_SUMMARY_COLUMNS only; use get_by_id() for the full row.
+        """
+        cls.ensure_table()
+        rows = get_connection().execute(SQL_LIST_INCIDENT_SUMMARIES).fetchall()
+        # zip(*rows) turns the rows into one tuple per column
+        columns = list(zip(*rows)) or [()] * len(INCIDENT_SUMMARY_COLUMNS)
+        return {name: list(values) for name, values in zip(INCIDENT_SUMMARY_COLUMNS, columns)}
 
     @classmethod
     def get_by_id(cls, incident_id: int) -> Optional["SecurityIncident"]:
         cls.ensure_table()
-        conn = get_connection()
-        try:
-            conn.row_factory = cls._dict_row_factory
-            row = conn.execute(
-                "SELECT * FROM cyber_incidents WHERE id = ?",
-                (incident_id,)
-            ).fetchone()
-            return cls.from_row(row) if row else None
-        finally:
-            conn.close()
+        row = get_connection().execute(SQL_GET_INCIDENT, (incident_id,)).fetchone()
+        return cls.from_row(row) if row else None
 
     @classmethod
     def count(cls) -> int:
         cls.ensure_table()
-        conn = get_connection()
-        try:
-            (n,) = conn.execute("SELECT COUNT(*) FROM cyber_incidents").fetchone()
-            return int(n)
-        finally:
-            conn.close()
+        (n,) = get_connection().execute(SQL_COUNT_INCIDENTS).fetchone()
+        return int(n)
+
+    @classmethod
+    def count_where(cls, **filters) -> int:
+        """Return the number of incidents matching every column=value filter,
+        e.g. count_where(status="Open")."""
+        unknown = set(filters) - INCIDENT_FILTER_COLUMNS
+        if unknown:
+            raise ValueError(f"Unknown incident column(s): {', '.join(sorted(unknown))}")
+        cls.ensure_table()
+        sql = SQL_COUNT_INCIDENTS
+        if filters:
+            sql += " WHERE " + " AND ".join(f"{column} = ?" for column in filters)
+        (n,) = get_connection().execute(sql, tuple(filters.values())).fetchone()
+        return int(n)
 
     @classmethod
     def create(cls, incident_type: str, severity: str, description: str, analyst: Optional[str] = None) -> "SecurityIncident":
         cls.ensure_table()
-        ts = datetime.utcnow().isoformat(timespec="seconds")
-        conn = get_connection()
-        try:
-            cur = conn.cursor()
-            cur.execute("""
-                INSERT INTO cyber_incidents (incident_type, severity, description, status, detected_at, resolved_at, analyst)
-                VALUES (?, ?, ?, 'Open', ?, NULL, ?)
-            """, (incident_type, severity, description, ts, analyst))
-            conn.commit()
+        ts = utc_timestamp()
+        with transaction() as conn:
+            cur = conn.execute(SQL_INSERT_INCIDENT, (incident_type, severity, description, ts, analyst))
             new_id = cur.lastrowid
-            return cls(new_id, incident_type, severity, description, "Open", ts, None, analyst)
-        finally:
-            conn.close()
+        return cls(new_id, incident_type, severity, description, "Open", ts, None, analyst)
+
+    @classmethod
+    def create_many(cls, rows: Iterable[Tuple[str, str, str, Optional[str]]]) -> int:
+        """
+        Insert (incident_type, severity, description, analyst) tuples as
+        Open incidents in one transaction. Returns the number inserted.
+        """
+        cls.ensure_table()
+        ts = utc_timestamp()
+        with transaction() as conn:
+            cur = conn.executemany(
+                SQL_INSERT_INCIDENT,
+                (
+                    (incident_type, severity, description, ts, analyst)
+                    for incident_type, severity, description, analyst in rows
+                ),
+            )
+        return cur.rowcount
 
     @classmethod
     def update(
@@ -355,65 +662,27 @@ class SecurityIncident:
         analyst: Optional[str] = None
     ) -> None:
         cls.ensure_table()
-        conn = get_connection()
-        try:
-            
-            current = cls.get_by_id(incident_id)
-            resolved_at = current.resolved_at if current else None
-
-            if status == "Resolved" and not resolved_at:
-                resolved_at = datetime.utcnow().isoformat(timespec="seconds")
-            if status != "Resolved":
-                resolved_at = None
-
-            conn.execute("""
-                UPDATE cyber_incidents
-                SET incident_type = ?, severity = ?, description = ?, status = ?, resolved_at = ?, analyst = ?
-                WHERE id = ?
-            """, (incident_type, severity, description, status, resolved_at, analyst, incident_id))
-            conn.commit()
-        finally:
-            conn.close()
+        with transaction() as conn:
+            conn.execute(
+                SQL_UPDATE_INCIDENT,
+                {
+                    "incident_type": incident_type,
+                    "severity": severity,
+                    "description": description,
+                    "status": status,
+                    "analyst": analyst,
+                    "now": utc_timestamp(),
+                    "id": incident_id,
+                },
+            )
 
     @classmethod
     def delete(cls, incident_id: int) -> None:
         cls.ensure_table()
-        conn = get_connection()
-        try:
-            conn.execute("DELETE FROM cyber_incidents WHERE id = ?", (incident_id,))
-            conn.commit()
-        finally:
-            conn.close()
+        with transaction() as conn:
+            conn.execute(SQL_DELETE_INCIDENT, (incident_id,))
 
-@staticmethod
-def from_row(row: Dict[str, Any]) -> "DatasetMetadata":
-    def safe_int(v, default=0):
-        try:
-            return int(v)
-        except (TypeError, ValueError):
-            return default
 
-    def safe_float(v, default=0.0):
-        try:
-            return float(v)
-        except (TypeError, ValueError):
-            return default
-
-    return DatasetMetadata(
-        id=row.get("id"),
-        dataset_name=row.get("dataset_name"),
-        source=row.get("source"),
-        owner=row.get("owner"),
-        rows=safe_int(row.get("rows")),
-        size_mb=safe_float(row.get("size_mb")),
-        sensitivity=row.get("sensitivity", "Low"),
-        last_updated=row.get("last_updated"),
-        status=row.get("status", "Active"),
-    )
-
-
-        
-        
 @dataclass
 class DatasetMetadata:
     id: Optional[int]
@@ -429,29 +698,13 @@ class DatasetMetadata:
     # ---------- TABLE ----------
     @classmethod
     def ensure_table(cls):
-        conn = get_connection()
-        try:
-            conn.execute("""
-                CREATE TABLE IF NOT EXISTS datasets_metadata (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    dataset_name TEXT NOT NULL,
-                    source TEXT NOT NULL,
-                    owner TEXT NOT NULL,
-                    rows INTEGER NOT NULL,
-                    size_mb REAL NOT NULL,
-                    sensitivity TEXT NOT NULL,
-                    last_updated TEXT NOT NULL,
-                    status TEXT NOT NULL DEFAULT 'Active'
-                );
-            """)
-            conn.commit()
-        finally:
-            conn.close()
+        _ensure_once("datasets_metadata", cls._create_table)
 
-    # ---------- ROW FACTORY ----------
     @classmethod
-    def _dict_row_factory(cls, cursor, row):
-        return {col[0]: row[idx] for idx, col in enumerate(cursor.description)}
+    def _create_table(cls):
+        with transaction() as conn:
+            conn.execute(SQL_CREATE_DATASETS)
+            conn.execute(SQL_INDEX_DATASETS)
 
     # ---------- SAFE CAST HELPERS ----------
     @staticmethod
@@ -470,57 +723,61 @@ class DatasetMetadata:
 
     # ---------- FROM ROW ----------
     @staticmethod
-    def from_row(row: Dict[str, Any]) -> "DatasetMetadata":
+    def from_row(row: Sequence) -> "DatasetMetadata":
+        # row is in DATASET_COLUMNS order
+        dataset_id, dataset_name, source, owner, row_count, size_mb, sensitivity, last_updated, status = row
         return DatasetMetadata(
-            id=row.get("id"),
-            dataset_name=row.get("dataset_name") or "Unnamed Dataset",
-            source=row.get("source") or "Unknown",
-            owner=row.get("owner") or "Unknown",
-            rows=DatasetMetadata._safe_int(row.get("rows")),
-            size_mb=DatasetMetadata._safe_float(row.get("size_mb")),
-            sensitivity=row.get("sensitivity") or "Low",
-            last_updated=row.get("last_updated") or "",
-            status=row.get("status") or "Active",
+            id=dataset_id,
+            dataset_name=dataset_name or "Unnamed Dataset",
+            source=source or "Unknown",
+            owner=owner or "Unknown",
+            rows=DatasetMetadata._safe_int(row_count),
+            size_mb=DatasetMetadata._safe_float(size_mb),
+            sensitivity=sensitivity or "Low",
+            last_updated=last_updated or "",
+            status=status or "Active",
         )
 
     # ---------- COUNT ----------
     @classmethod
     def count(cls) -> int:
         cls.ensure_table()
-        conn = get_connection()
-        try:
-            (n,) = conn.execute("SELECT COUNT(*) FROM datasets_metadata").fetchone()
-            return int(n)
-        finally:
-            conn.close()
+        (n,) = get_connection().execute(SQL_COUNT_DATASETS).fetchone()
+        return int(n)
+
+    @classmethod
+    def source_counts(cls) -> Dict[str, int]:
+        """Return {source: number of datasets}, most common first."""
+        cls.ensure_table()
+        return dict(get_connection().execute(SQL_DATASET_SOURCE_COUNTS).fetchall())
+
+    @classmethod
+    def summary(cls) -> Dict[str, float]:
+        """Return the dashboard KPIs (total, total_size_mb, active, sensitive)
+        from a single aggregate query."""
+        cls.ensure_table()
+        total, total_size, active, sensitive = get_connection().execute(
+            SQL_DATASET_SUMMARY, SENSITIVE_LEVELS
+        ).fetchone()
+        return {
+            "total": int(total),
+            "total_size_mb": float(total_size),
+            "active": int(active),
+            "sensitive": int(sensitive),
+        }
 
     # ---------- READ ----------
     @classmethod
     def get_all(cls) -> List["DatasetMetadata"]:
         cls.ensure_table()
-        conn = get_connection()
-        try:
-            conn.row_factory = cls._dict_row_factory
-            rows = conn.execute(
-                "SELECT * FROM datasets_metadata ORDER BY id DESC"
-            ).fetchall()
-            return [cls.from_row(r) for r in rows]
-        finally:
-            conn.close()
+        rows = get_connection().execute(SQL_LIST_DATASETS).fetchall()
+        return [cls.from_row(r) for r in rows]
 
     @classmethod
     def get_by_id(cls, dataset_id: int) -> Optional["DatasetMetadata"]:
         cls.ensure_table()
-        conn = get_connection()
-        try:
-            conn.row_factory = cls._dict_row_factory
-            row = conn.execute(
-                "SELECT * FROM datasets_metadata WHERE id = ?",
-                (dataset_id,)
-            ).fetchone()
-            return cls.from_row(row) if row else None
-        finally:
-            conn.close()
+        row = get_connection().execute(SQL_GET_DATASET, (dataset_id,)).fetchone()
+        return cls.from_row(row) if row else None
 
     # ---------- CREATE ----------
     @classmethod
@@ -536,16 +793,10 @@ class DatasetMetadata:
         last_updated: Optional[str] = None
     ) -> "DatasetMetadata":
         cls.ensure_table()
-        ts = last_updated or datetime.utcnow().isoformat(timespec="seconds")
+        ts = last_updated or utc_timestamp()
 
-        conn = get_connection()
-        try:
-            cur = conn.cursor()
-            cur.execute("""
-                INSERT INTO datasets_metadata
-                (dataset_name, source, owner, rows, size_mb, sensitivity, last_updated, status)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
+        with transaction() as conn:
+            cur = conn.execute(SQL_INSERT_DATASET, (
                 dataset_name,
                 source,
                 owner,
@@ -555,22 +806,39 @@ class DatasetMetadata:
                 ts,
                 status
             ))
-            conn.commit()
             new_id = cur.lastrowid
 
-            return cls(
-                new_id,
-                dataset_name,
-                source,
-                owner,
-                cls._safe_int(rows),
-                cls._safe_float(size_mb),
-                sensitivity,
-                ts,
-                status
+        return cls(
+            new_id,
+            dataset_name,
+            source,
+            owner,
+            cls._safe_int(rows),
+            cls._safe_float(size_mb),
+            sensitivity,
+            ts,
+            status
+        )
+
+    @classmethod
+    def create_many(cls, rows: Iterable[tuple]) -> int:
+        """
+        Insert (dataset_name, source, owner, rows, size_mb, sensitivity,
+        status) tuples in one transaction, all stamped with the same
+        last_updated. rows / size_mb are stored as given, so convert them
+        to int / float first. Returns the number inserted.
+        """
+        cls.ensure_table()
+        ts = utc_timestamp()
+        with transaction() as conn:
+            cur = conn.executemany(
+                SQL_INSERT_DATASET,
+                (
+                    (dataset_name, source, owner, row_count, size_mb, sensitivity, ts, status)
+                    for dataset_name, source, owner, row_count, size_mb, sensitivity, status in rows
+                ),
             )
-        finally:
-            conn.close()
+        return cur.rowcount
 
     # ---------- UPDATE ----------
     @classmethod
@@ -586,22 +854,10 @@ class DatasetMetadata:
         status: str
     ) -> None:
         cls.ensure_table()
-        ts = datetime.utcnow().isoformat(timespec="seconds")
+        ts = utc_timestamp()
 
-        conn = get_connection()
-        try:
-            conn.execute("""
-                UPDATE datasets_metadata
-                SET dataset_name = ?,
-                    source = ?,
-                    owner = ?,
-                    rows = ?,
-                    size_mb = ?,
-                    sensitivity = ?,
-                    last_updated = ?,
-                    status = ?
-                WHERE id = ?
-            """, (
+        with transaction() as conn:
+            conn.execute(SQL_UPDATE_DATASET, (
                 dataset_name,
                 source,
                 owner,
@@ -612,20 +868,10 @@ class DatasetMetadata:
                 status,
                 dataset_id
             ))
-            conn.commit()
-        finally:
-            conn.close()
 
     # ---------- DELETE ----------
     @classmethod
     def delete(cls, dataset_id: int) -> None:
         cls.ensure_table()
-        conn = get_connection()
-        try:
-            conn.execute(
-                "DELETE FROM datasets_metadata WHERE id = ?",
-                (dataset_id,)
-            )
-            conn.commit()
-        finally:
-            conn.close()
\ No newline at end of file
+        with transaction() as conn:
+            conn.execute(SQL_DELETE_DATASET, (dataset_id,))
\ No newline at end of file
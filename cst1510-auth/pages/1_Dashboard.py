@@ -4,6 +4,16 @@ import streamlit as st
 import pandas as pd
 import plotly.express as px
 from models import ITTicket, ensure_it_tickets_table
+from ticket_cache import (
+    clear_ticket_cache,
+    load_ticket_counts,
+    load_ticket_ids,
+    load_ticket_options,
+    load_ticket_page_df,
+)
+
+# Rows shown per page of the ticket table
+TICKETS_PER_PAGE = 100
 
 
 # ---------- Streamlit Config ----------
@@ -34,37 +44,54 @@ st.divider()
 
 
 # ---------- Load Tickets ----------
+# Cached across reruns; every write below clears the cache
 ensure_it_tickets_table()
-tickets = ITTicket.get_all()
-tickets_df = pd.DataFrame([t.to_dict() for t in tickets])
+# Only the ids are loaded, for the update / delete selectboxes
+ticket_ids = load_ticket_ids()
+
+# KPIs and charts are counted by SQL, not from the ticket list
+status_counts, priority_counts = load_ticket_counts()
+total_tickets = sum(status_counts.values())
 
 
 # ---------- No Data Case ----------
-if tickets_df.empty:
+if total_tickets == 0:
     st.info("No tickets found. Create one using the form below.")
 else:
     # KPIs
     col1, col2, col3 = st.columns(3)
-    col1.metric("Total Tickets", len(tickets_df))
-    col2.metric("Open Tickets", (tickets_df["status"] == "Open").sum())
-    col3.metric("High Priority", (tickets_df["priority"] == "High").sum())
+    col1.metric("Total Tickets", total_tickets)
+    col2.metric("Open Tickets", status_counts.get("Open", 0))
+    col3.metric("High Priority", priority_counts.get("High", 0))
 
     st.divider()
 
-    # Table
+    # Table (the DataFrame is only built when asked for; Streamlit runs an
+    # expander's body even while it is collapsed, so a checkbox gates it)
     st.subheader("All Tickets")
-    st.dataframe(tickets_df, use_container_width=True)
+    if st.checkbox("Show all tickets", key="show_all_tickets"):
+        # Only the visible page is fetched (LIMIT/OFFSET)
+        page_count = (total_tickets + TICKETS_PER_PAGE - 1) // TICKETS_PER_PAGE
+        page = st.number_input("Page", min_value=1, max_value=page_count, value=1, step=1)
+        tickets_df = load_ticket_page_df(int(page), TICKETS_PER_PAGE)
+        st.dataframe(tickets_df, use_container_width=True)
+        st.caption(f"Page {int(page)} of {page_count}")
 
     # Charts
     st.subheader("Tickets by Status")
-    status_count = tickets_df["status"].value_counts().reset_index()
-    status_count.columns = ["status", "count"]
-    st.plotly_chart(px.bar(status_count, x="status", y="count"), use_container_width=True)
+    # Tickets without a status / priority get no bar or slice, as with value_counts()
+    status_count = pd.DataFrame(
+        [(k, v) for k, v in status_counts.items() if k is not None], columns=["status", "count"]
+    )
+    st.plotly_chart(px.bar(status_count, x="status", y="count"), use_container_width=True,
+                    key="tickets_by_status")
 
     st.subheader("Tickets by Priority")
-    pr_count = tickets_df["priority"].value_counts().reset_index()
-    pr_count.columns = ["priority", "count"]
-    st.plotly_chart(px.pie(pr_count, names="priority", values="count"), use_container_width=True)
+    pr_count = pd.DataFrame(
+        [(k, v) for k, v in priority_counts.items() if k is not None], columns=["priority", "count"]
+    )
+    st.plotly_chart(px.pie(pr_count, names="priority", values="count"), use_container_width=True,
+                    key="tickets_by_priority")
 
 
 st.divider()
@@ -83,6 +110,7 @@ with st.form("create_ticket_form"):
             st.warning("Title cannot be empty.")
         else:
             new_ticket = ITTicket.create(title, priority, status)
+            clear_ticket_cache()
             st.success(f"Ticket created (ID {new_ticket.id}).")
             st.rerun()
 
@@ -92,16 +120,18 @@ st.divider()
 # ---------- Update Ticket ----------
 st.subheader("Update an Existing Ticket")
 
-if len(tickets) > 0:
-    ticket_ids = [t.id for t in tickets]
+if ticket_ids:
     selected = st.selectbox("Select Ticket ID to update", ticket_ids, key="update_ticket_id")
 
     selected_ticket = ITTicket.get_by_id(int(selected))
 
+    # Values already used by some ticket, from SQL DISTINCT (cached)
+    used_statuses, used_priorities = load_ticket_options()
+
     if selected_ticket:
         # Dynamic priority list (includes both default and existing values)
         base_priorities = ["Low", "Medium", "High"]
-        priority_options = sorted(set(base_priorities + [t.priority for t in tickets]))
+        priority_options = sorted(set(base_priorities).union(used_priorities))
 
         if selected_ticket.priority not in priority_options:
             priority_options.append(selected_ticket.priority)
@@ -115,7 +145,7 @@ if len(tickets) > 0:
 
         # Dynamic status list (includes both default and existing values)
         base_statuses = ["Open", "In Progress", "Closed"]
-        status_options = sorted(set(base_statuses + [t.status for t in tickets]))
+        status_options = sorted(set(base_statuses).union(used_statuses))
 
         if selected_ticket.status not in status_options:
             status_options.append(selected_ticket.status)
@@ -129,6 +159,7 @@ if len(tickets) > 0:
 
         if st.button("Update Ticket"):
             selected_ticket.update(new_priority, new_status)
+            clear_ticket_cache()
             st.success("Ticket updated successfully!")
             st.rerun()
 else:
@@ -140,10 +171,10 @@ st.divider()
 # ---------- Delete Ticket ----------
 st.subheader("Delete Ticket")
 
-if len(tickets) > 0:
+if ticket_ids:
     del_id = st.selectbox(
         "Select Ticket ID to delete",
-        [t.id for t in tickets],
+        ticket_ids,
         key="delete_ticket_id",
     )
 
@@ -157,6 +188,7 @@ if len(tickets) > 0:
             t = ITTicket.get_by_id(int(del_id))
             if t:
                 t.delete()
+                clear_ticket_cache()
                 st.success(f"Ticket {del_id} deleted.")
                 st.rerun()
         else:
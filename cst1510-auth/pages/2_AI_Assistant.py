@@ -1,9 +1,9 @@
 # pages/2_AI_Assistant.py
 
 import streamlit as st
-import pandas as pd
-from models import ITTicket, ensure_it_tickets_table
+from models import ensure_it_tickets_table
 from ai_helper import ask_ai
+from ticket_cache import ticket_context
 
 
 # ---------- Streamlit Config ----------
@@ -31,22 +31,9 @@ st.write("Ask the AI anything about trends, risks or improvements.")
 
 
 # ---------- Load Ticket Context ----------
+# Cached across reruns (shared with the Dashboard, which clears it on writes)
 ensure_it_tickets_table()
-tickets = ITTicket.get_all()
-
-if tickets:
-    df = pd.DataFrame([t.to_dict() for t in tickets])
-
-    context = f"There are {len(df)} tickets. "
-
-    if "status" in df:
-        context += f"Status counts: {df['status'].value_counts().to_dict()}. "
-
-    if "priority" in df:
-        context += f"Priority counts: {df['priority'].value_counts().to_dict()}. "
-else:
-    df = pd.DataFrame()
-    context = "There are no tickets currently in the system."
+context = ticket_context()
 
 
 # ---------- UI ----------
@@ -69,11 +56,11 @@ with col2:
         if not question.strip():
             answer_box.warning("Please type a question first.")
         else:
-            with st.spinner("Thinking..."):
+            # Tokens are rendered as they arrive instead of after the full reply
+            with answer_box.container():
                 try:
-                    answer = ask_ai(question, context=context)
-                    answer_box.success(answer)
+                    st.write_stream(ask_ai(question, context=context))
                 except Exception as e:
-                    answer_box.error(str(e))
+                    st.error(str(e))
 
 st.divider()
@@ -1,9 +1,28 @@
 import streamlit as st
-import pandas as pd
 import plotly.express as px
 
 from models import SecurityIncident
 from load_data import load_cyber_incidents_from_csv
+from incident_cache import (
+    bump_incidents_version,
+    incidents_version,
+    load_incident_insights,
+    load_incident_kpis,
+    load_incident,
+    load_incidents,
+    load_phishing_trend,
+)
+
+# Form options, with option -> position maps for the selectbox index
+INCIDENT_TYPES = ("Malware", "Phishing", "DoS Attack", "Insider Threat", "Other")
+INCIDENT_TYPE_INDEX = {v: i for i, v in enumerate(INCIDENT_TYPES)}
+SEVERITIES = ("Low", "Medium", "High", "Critical")
+SEVERITY_INDEX = {v: i for i, v in enumerate(SEVERITIES)}
+STATUSES = ("Open", "Resolved")
+STATUS_INDEX = {v: i for i, v in enumerate(STATUSES)}
+
+# Rows shown per page of the incidents table
+INCIDENTS_PER_PAGE = 100
 
 st.set_page_config(page_title="Cybersecurity Incidents", page_icon="🛡️", layout="wide")
 
@@ -21,6 +40,7 @@ with st.expander("📥 Load sample data (CSV)", expanded=False):
     if st.button("Load cyber_incidents.csv"):
         try:
             n = load_cyber_incidents_from_csv("Data/cyber_incidents.csv")
+            bump_incidents_version()
             if n == 0:
                 st.info("No rows inserted (table already had data).")
             else:
@@ -30,16 +50,14 @@ with st.expander("📥 Load sample data (CSV)", expanded=False):
             st.error(f"Failed to load CSV: {e}")
 
 # ---- Fetch data ----
-incidents = SecurityIncident.get_all()
-df = pd.DataFrame([i.__dict__ for i in incidents])
+# Cached across reruns; every write below bumps the version
+df = load_incidents(incidents_version())
 
 # ---- KPIs ----
 k1, k2, k3, k4 = st.columns(4)
 
-total = len(df)
-open_count = int((df["status"] == "Open").sum()) if not df.empty else 0
-resolved_count = int((df["status"] == "Resolved").sum()) if not df.empty else 0
-phishing_count = int((df["incident_type"] == "Phishing").sum()) if not df.empty else 0
+# Counted by SQL (cached), not by scanning the DataFrame
+total, open_count, resolved_count, phishing_count = load_incident_kpis(incidents_version())
 
 k1.metric("Total Incidents", total)
 k2.metric("Open", open_count)
@@ -53,7 +71,12 @@ st.subheader("All Cybersecurity Incidents")
 if df.empty:
     st.info("No incidents yet. Load sample data or create a new incident below.")
 else:
-    st.dataframe(df, use_container_width=True, hide_index=True)
+    # Only the visible page is sent to the browser
+    page_count = (len(df) + INCIDENTS_PER_PAGE - 1) // INCIDENTS_PER_PAGE
+    page = int(st.number_input("Page", min_value=1, max_value=page_count, value=1, step=1, key="incidents_page"))
+    start = (page - 1) * INCIDENTS_PER_PAGE
+    st.dataframe(df.iloc[start:start + INCIDENTS_PER_PAGE], use_container_width=True, hide_index=True)
+    st.caption(f"Page {page} of {page_count}")
 
 st.divider()
 
@@ -62,9 +85,9 @@ st.subheader("Report New Incident (Create)")
 with st.form("new_incident"):
     c1, c2, c3 = st.columns(3)
     with c1:
-        incident_type = st.selectbox("Incident Type", ["Malware", "Phishing", "DoS Attack", "Insider Threat", "Other"])
+        incident_type = st.selectbox("Incident Type", INCIDENT_TYPES)
     with c2:
-        severity = st.selectbox("Severity", ["Low", "Medium", "High", "Critical"])
+        severity = st.selectbox("Severity", SEVERITIES)
     with c3:
         analyst = st.text_input("Assigned Analyst (optional)")
 
@@ -75,7 +98,8 @@ if submit:
     if not description.strip():
         st.warning("Description cannot be empty.")
     else:
-        SecurityIncident.create(incident_type, severity, description, analyst if analyst.strip() else None)
+        SecurityIncident.create(incident_type, severity, description, analyst.strip() or None)
+        bump_incidents_version()
         st.success("Incident created successfully.")
         st.rerun()
 
@@ -89,7 +113,9 @@ else:
     ids = df["id"].tolist()
     selected_id = st.selectbox("Select Incident ID", ids)
 
-    incident = SecurityIncident.get_by_id(int(selected_id))
+    # The table holds no description / analyst, so the full row is read
+    # here, cached per incident until the next write
+    incident = load_incident(incidents_version(), int(selected_id))
     if incident is None:
         st.error("Incident not found.")
     else:
@@ -98,22 +124,20 @@ else:
             with u1:
                 u_type = st.selectbox(
                     "Incident Type",
-                    ["Malware", "Phishing", "DoS Attack", "Insider Threat", "Other"],
-                    index=["Malware", "Phishing", "DoS Attack", "Insider Threat", "Other"].index(incident.incident_type)
-                    if incident.incident_type in ["Malware", "Phishing", "DoS Attack", "Insider Threat", "Other"] else 4
+                    INCIDENT_TYPES,
+                    index=INCIDENT_TYPE_INDEX.get(incident.incident_type, INCIDENT_TYPE_INDEX["Other"])
                 )
             with u2:
                 u_sev = st.selectbox(
                     "Severity",
-                    ["Low", "Medium", "High", "Critical"],
-                    index=["Low", "Medium", "High", "Critical"].index(incident.severity)
-                    if incident.severity in ["Low", "Medium", "High", "Critical"] else 0
+                    SEVERITIES,
+                    index=SEVERITY_INDEX.get(incident.severity, 0)
                 )
             with u3:
                 u_status = st.selectbox(
                     "Status",
-                    ["Open", "Resolved"],
-                    index=0 if incident.status == "Open" else 1
+                    STATUSES,
+                    index=STATUS_INDEX.get(incident.status, STATUS_INDEX["Resolved"])
                 )
 
             u_analyst = st.text_input("Assigned Analyst (optional)", value=incident.analyst or "")
@@ -131,8 +155,9 @@ else:
                     severity=u_sev,
                     description=u_desc,
                     status=u_status,
-                    analyst=u_analyst.strip() if u_analyst.strip() else None
+                    analyst=u_analyst.strip() or None
                 )
+                bump_incidents_version()
                 st.success("Incident updated.")
                 st.rerun()
 
@@ -140,55 +165,57 @@ else:
         confirm = st.checkbox("I understand this will permanently delete the incident.")
         if st.button("Delete Incident", disabled=not confirm):
             SecurityIncident.delete(int(selected_id))
+            bump_incidents_version()
             st.success("Incident deleted.")
             st.rerun()
 
 st.divider()
 
 # ---- Insights / Charts (Tier 2 high-value) ----
+# Every chart has a fixed key so its element is kept across reruns
 st.subheader("Insights & Visualizations")
 
 if df.empty:
     st.info("No data for charts yet.")
 else:
-    # Parse timestamps safely
-    df2 = df.copy()
-    df2["detected_at_dt"] = pd.to_datetime(df2["detected_at"], errors="coerce")
-    df2["resolved_at_dt"] = pd.to_datetime(df2["resolved_at"], errors="coerce")
-
-    # Resolution time in minutes (bottleneck)
-    df2["resolution_minutes"] = (df2["resolved_at_dt"] - df2["detected_at_dt"]).dt.total_seconds() / 60
-    # Keep only resolved with valid times
-    resolved_df = df2[(df2["status"] == "Resolved") & (df2["resolution_minutes"].notna()) & (df2["resolution_minutes"] >= 0)]
+    # Parsed timestamps and resolution time in minutes (bottleneck),
+    # computed once per table version
+    df2 = load_incident_insights(incidents_version())
+    # Keep only resolved with valid times; one mask built on the raw numpy
+    # arrays (NaN >= 0 is False, so missing times drop out too)
+    minutes = df2["resolution_minutes"].to_numpy()
+    # (status is categorical, so == compares integer codes)
+    resolved_df = df2[(df2["status"] == "Resolved").to_numpy() & (minutes >= 0)]
 
     left, right = st.columns(2)
 
     with left:
         st.markdown("#### Incidents by Severity")
         fig1 = px.bar(df2, x="severity", title="Severity Distribution")
-        st.plotly_chart(fig1, use_container_width=True)
+        st.plotly_chart(fig1, use_container_width=True, key="incident_severity")
 
     with right:
         st.markdown("#### Incidents by Type")
         fig2 = px.pie(df2, names="incident_type", title="Incident Types")
-        st.plotly_chart(fig2, use_container_width=True)
+        st.plotly_chart(fig2, use_container_width=True, key="incident_types")
 
     st.markdown("#### Phishing Trend (Spike Detection)")
-    # Group by day for trend
-    trend = df2.dropna(subset=["detected_at_dt"]).copy()
-    trend["day"] = trend["detected_at_dt"].dt.date
-    phishing_trend = trend[trend["incident_type"] == "Phishing"].groupby("day").size().reset_index(name="count")
+    # Daily counts are grouped by SQL (at most one row per day), not pandas
+    phishing_trend = load_phishing_trend(incidents_version())
     if phishing_trend.empty:
         st.info("No phishing incidents yet to show a trend.")
     else:
-        fig3 = px.line(phishing_trend, x="day", y="count", title="Phishing Incidents Over Time (Daily)")
-        st.plotly_chart(fig3, use_container_width=True)
+        # WebGL (scattergl) keeps long daily series fast to draw
+        fig3 = px.line(phishing_trend, x="day", y="count", title="Phishing Incidents Over Time (Daily)",
+                       render_mode="webgl")
+        st.plotly_chart(fig3, use_container_width=True, key="phishing_trend")
 
     st.markdown("#### Response Bottleneck (Avg Resolution Time)")
     if resolved_df.empty:
         st.info("No resolved incidents yet to calculate resolution time bottlenecks.")
     else:
-        bottleneck = resolved_df.groupby("incident_type")["resolution_minutes"].mean().reset_index()
+        # observed=True: only types that have resolved incidents get a bar
+        bottleneck = resolved_df.groupby("incident_type", observed=True)["resolution_minutes"].mean().reset_index()
         fig4 = px.bar(bottleneck, x="incident_type", y="resolution_minutes",
                       title="Average Resolution Time by Incident Type (minutes)")
-        st.plotly_chart(fig4, use_container_width=True)
+        st.plotly_chart(fig4, use_container_width=True, key="resolution_by_type")
@@ -1,9 +1,25 @@
 import streamlit as st
-import pandas as pd
 import plotly.express as px
 
 from models import DatasetMetadata
 from load_data import load_datasets_metadata_from_csv
+from dataset_cache import (
+    bump_datasets_version,
+    datasets_version,
+    load_dataset_kpis,
+    load_datasets,
+    load_datasets_by_id,
+    load_source_counts,
+)
+
+# Form options, with option -> position maps for the selectbox index
+SENSITIVITIES = ("Low", "Medium", "High", "Confidential")
+SENSITIVITY_INDEX = {v: i for i, v in enumerate(SENSITIVITIES)}
+STATUSES = ("Active", "Archived")
+STATUS_INDEX = {v: i for i, v in enumerate(STATUSES)}
+
+# Rows shown per page of the datasets table
+DATASETS_PER_PAGE = 100
 
 st.set_page_config(page_title="Data Science", page_icon="📊", layout="wide")
 
@@ -21,6 +37,7 @@ with st.expander("📥 Load sample data (CSV)", expanded=False):
     if st.button("Load datasets_metadata.csv"):
         try:
             n = load_datasets_metadata_from_csv("Data/datasets_metadata.csv")
+            bump_datasets_version()
             if n == 0:
                 st.info("No rows inserted (table already had data).")
             else:
@@ -30,16 +47,18 @@ with st.expander("📥 Load sample data (CSV)", expanded=False):
             st.error(f"Failed to load CSV: {e}")
 
 # ---- Fetch data ----
-items = DatasetMetadata.get_all()
-df = pd.DataFrame([i.__dict__ for i in items])
+# Cached across reruns; every write below bumps the version
+df = load_datasets(datasets_version())
 
 # ---- KPIs ----
 k1, k2, k3, k4 = st.columns(4)
 
-total = len(df)
-total_size = float(df["size_mb"].sum()) if not df.empty else 0.0
-active = int((df["status"] == "Active").sum()) if not df.empty else 0
-sensitive = int((df["sensitivity"].astype(str).str.lower().isin(["high", "confidential", "pii", "restricted"])).sum()) if not df.empty else 0
+# Aggregated by SQL (cached), not by scanning the DataFrame
+kpis = load_dataset_kpis(datasets_version())
+total = kpis["total"]
+total_size = kpis["total_size_mb"]
+active = kpis["active"]
+sensitive = kpis["sensitive"]
 
 k1.metric("Total Datasets", total)
 k2.metric("Total Size (MB)", round(total_size, 2))
@@ -53,7 +72,12 @@ st.subheader("All Datasets")
 if df.empty:
     st.info("No datasets yet. Load sample data or create a new dataset below.")
 else:
-    st.dataframe(df, use_container_width=True, hide_index=True)
+    # Only the visible page is sent to the browser
+    page_count = (len(df) + DATASETS_PER_PAGE - 1) // DATASETS_PER_PAGE
+    page = int(st.number_input("Page", min_value=1, max_value=page_count, value=1, step=1, key="datasets_page"))
+    start = (page - 1) * DATASETS_PER_PAGE
+    st.dataframe(df.iloc[start:start + DATASETS_PER_PAGE], use_container_width=True, hide_index=True)
+    st.caption(f"Page {page} of {page_count}")
 
 st.divider()
 
@@ -66,19 +90,20 @@ with st.form("new_dataset"):
         source = st.text_input("Source / Department")
     with c2:
         owner = st.text_input("Owner / Steward")
-        sensitivity = st.selectbox("Sensitivity", ["Low", "Medium", "High", "Confidential"])
+        sensitivity = st.selectbox("Sensitivity", SENSITIVITIES)
     with c3:
         rows = st.number_input("Rows", min_value=0, value=0, step=1000)
         size_mb = st.number_input("Size (MB)", min_value=0.0, value=0.0, step=10.0)
 
-    status = st.selectbox("Status", ["Active", "Archived"])
+    status = st.selectbox("Status", STATUSES)
     submit = st.form_submit_button("Create Dataset")
 
 if submit:
-    if not dataset_name.strip() or not source.strip() or not owner.strip():
+    if not all(map(str.strip, (dataset_name, source, owner))):
         st.warning("Dataset Name, Source, and Owner are required.")
     else:
         DatasetMetadata.create(dataset_name, source, owner, int(rows), float(size_mb), sensitivity, status=status)
+        bump_datasets_version()
         st.success("Dataset created successfully.")
         st.rerun()
 
@@ -92,7 +117,8 @@ else:
     ids = df["id"].tolist()
     selected_id = st.selectbox("Select Dataset ID", ids)
 
-    item = DatasetMetadata.get_by_id(int(selected_id))
+    # Read from the cached rows the table was built from, not the database
+    item = load_datasets_by_id(datasets_version()).get(int(selected_id))
     if item is None:
         st.error("Dataset not found.")
     else:
@@ -103,21 +129,21 @@ else:
                 u_source = st.text_input("Source / Department", value=item.source)
             with u2:
                 u_owner = st.text_input("Owner / Steward", value=item.owner)
-                u_sens = st.selectbox("Sensitivity", ["Low", "Medium", "High", "Confidential"],
-                                      index=["Low", "Medium", "High", "Confidential"].index(item.sensitivity)
-                                      if item.sensitivity in ["Low", "Medium", "High", "Confidential"] else 0)
+                u_sens = st.selectbox("Sensitivity", SENSITIVITIES,
+                                      index=SENSITIVITY_INDEX.get(item.sensitivity, 0))
             with u3:
                 u_rows = st.number_input("Rows", min_value=0, value=int(item.rows), step=1000)
                 u_size = st.number_input("Size (MB)", min_value=0.0, value=float(item.size_mb), step=10.0)
 
-            u_status = st.selectbox("Status", ["Active", "Archived"], index=0 if item.status == "Active" else 1)
+            u_status = st.selectbox("Status", STATUSES, index=STATUS_INDEX.get(item.status, STATUS_INDEX["Archived"]))
             updated = st.form_submit_button("Update Dataset")
 
         if updated:
-            if not u_name.strip() or not u_source.strip() or not u_owner.strip():
+            if not all(map(str.strip, (u_name, u_source, u_owner))):
                 st.warning("Dataset Name, Source, and Owner are required.")
             else:
                 DatasetMetadata.update(int(selected_id), u_name, u_source, u_owner, int(u_rows), float(u_size), u_sens, u_status)
+                bump_datasets_version()
                 st.success("Dataset updated.")
                 st.rerun()
 
@@ -125,6 +151,7 @@ else:
         confirm = st.checkbox("I understand this will permanently delete the dataset.")
         if st.button("Delete Dataset", disabled=not confirm):
             DatasetMetadata.delete(int(selected_id))
+            bump_datasets_version()
             st.success("Dataset deleted.")
             st.rerun()
 
@@ -140,24 +167,28 @@ else:
 
     with left:
         st.markdown("#### Top Datasets by Size (MB)")
-        top_size = df.sort_values("size_mb", ascending=False).head(10)
+        top_size = df.nlargest(10, "size_mb")
         fig1 = px.bar(top_size, x="dataset_name", y="size_mb", title="Top 10 Datasets by Size (MB)")
-        st.plotly_chart(fig1, use_container_width=True)
+        st.plotly_chart(fig1, use_container_width=True, key="top_by_size")
 
     with right:
         st.markdown("#### Top Datasets by Rows")
-        top_rows = df.sort_values("rows", ascending=False).head(10)
+        top_rows = df.nlargest(10, "rows")
         fig2 = px.bar(top_rows, x="dataset_name", y="rows", title="Top 10 Datasets by Row Count")
-        st.plotly_chart(fig2, use_container_width=True)
+        st.plotly_chart(fig2, use_container_width=True, key="top_by_rows")
 
     st.markdown("#### Source Dependency (Datasets by Source)")
-    by_source = df.groupby("source").size().reset_index(name="count").sort_values("count", ascending=False)
+    # Grouped and sorted by SQL (one row per source), not pandas
+    by_source = load_source_counts(datasets_version())
     fig3 = px.bar(by_source, x="source", y="count", title="Datasets by Source / Department")
-    st.plotly_chart(fig3, use_container_width=True)
+    st.plotly_chart(fig3, use_container_width=True, key="datasets_by_source")
 
     st.markdown("#### Governance / Archiving Signal")
     # simple rule: large + low sensitivity -> candidates for archiving or tiered storage
-    candidates = df[(df["size_mb"] > df["size_mb"].median()) & (df["sensitivity"].isin(["Low", "Medium"]))].copy()
+    # Only the 20 largest are shown, so nlargest() picks them without a copy
+    # of every matching row
+    candidates = df.loc[(df["size_mb"] > df["size_mb"].median()) & df["sensitivity"].isin(("Low", "Medium"))]
+    candidates = candidates.nlargest(20, "size_mb")
     st.caption("Heuristic: large datasets with Low/Medium sensitivity may be candidates for tiered storage or archiving.")
-    st.dataframe(candidates[["id", "dataset_name", "source", "owner", "size_mb", "sensitivity", "status"]].head(20),
+    st.dataframe(candidates[["id", "dataset_name", "source", "owner", "size_mb", "sensitivity", "status"]],
                  use_container_width=True, hide_index=True)
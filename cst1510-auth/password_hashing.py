@@ -0,0 +1,26 @@
+# password_hashing.py
+#
+# Password hashing shared by the web app (auth_db.py) and the CLI
+# (main.py). New hashes are Argon2id; bcrypt hashes ("$2...") written
+# before the switch still verify.
+
+import bcrypt
+from argon2 import PasswordHasher
+from argon2.exceptions import InvalidHashError, VerificationError
+
+# Argon2id hasher used for all new passwords
+password_hasher = PasswordHasher(time_cost=2, memory_cost=65536, parallelism=1)
+
+
+def check_password(stored_hash: str, plain_password: str) -> bool:
+    """
+    Check a password against an Argon2 hash, or a bcrypt hash ("$2...")
+    for accounts created before the switch to Argon2.
+    """
+    if stored_hash.startswith("$2"):
+        return bcrypt.checkpw(plain_password.encode("utf-8"), stored_hash.encode("utf-8"))
+
+    try:
+        return password_hasher.verify(stored_hash, plain_password)
+    except (VerificationError, InvalidHashError):
+        return False
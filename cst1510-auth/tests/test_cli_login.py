@@ -0,0 +1,48 @@
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import main  # noqa: E402
+from password_hashing import password_hasher  # noqa: E402
+
+
+class CliLoginTest(unittest.TestCase):
+    """main.login_user against users written by the web app (Argon2id)."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.saved = (main.DB_FILE, main.USER_DATA_FILE, main._db, main._LEGACY_USERS)
+        main.DB_FILE = os.path.join(self.tmp.name, "database.db")
+        main.USER_DATA_FILE = os.path.join(self.tmp.name, "users.txt")
+        main._db = None
+        main._LEGACY_USERS = None
+
+        main.get_db().execute(
+            "INSERT INTO users (username, password_hash) VALUES (?, ?);",
+            ("alice", password_hasher.hash("Secret123")),
+        )
+
+    def tearDown(self):
+        main._db.close()
+        main.DB_FILE, main.USER_DATA_FILE, main._db, main._LEGACY_USERS = self.saved
+        self.tmp.cleanup()
+
+    def test_argon2_row_logs_in(self):
+        self.assertTrue(main.login_user("alice", "Secret123"))
+
+    def test_argon2_row_rejects_wrong_password(self):
+        self.assertFalse(main.login_user("alice", "Wrong123"))
+
+    def test_bcrypt_row_still_logs_in(self):
+        main.get_db().execute(
+            "INSERT INTO users (username, password_hash) VALUES (?, ?);",
+            ("bob", main.hash_password("Secret123")),
+        )
+        self.assertTrue(main.login_user("bob", "Secret123"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,70 @@
+# ticket_cache.py
+#
+# Ticket data shared by the Streamlit pages, memoised across reruns so a
+# widget change does not re-query SQLite or rebuild the DataFrame.
+# Anything that writes tickets must call clear_ticket_cache() afterwards.
+
+from typing import Dict, List, Tuple
+
+import pandas as pd
+import streamlit as st
+
+from models import ITTicket
+
+# Other processes (load_data.py, the CLI) can change tickets too, so
+# cached values expire after this many seconds
+TICKET_CACHE_TTL = 30
+
+
+@st.cache_data(ttl=TICKET_CACHE_TTL, show_spinner=False)
+def load_ticket_ids() -> List[int]:
+    """Every ticket id, ascending (for the update / delete selectboxes)."""
+    return ITTicket.ids()
+
+
+@st.cache_data(ttl=TICKET_CACHE_TTL, show_spinner=False)
+def load_ticket_page_df(page: int, page_size: int) -> pd.DataFrame:
+    """One page (1-based) of tickets, newest first, as a DataFrame."""
+    tickets = ITTicket.get_page((page - 1) * page_size, page_size)
+    return pd.DataFrame([t.to_dict() for t in tickets])
+
+
+@st.cache_data(ttl=TICKET_CACHE_TTL, show_spinner=False)
+def load_ticket_counts() -> Tuple[Dict[str, int], Dict[str, int]]:
+    """(status counts, priority counts), each most common first."""
+    return ITTicket.status_counts(), ITTicket.priority_counts()
+
+
+@st.cache_data(ttl=TICKET_CACHE_TTL, show_spinner=False)
+def load_ticket_options() -> Tuple[List[str], List[str]]:
+    """(statuses, priorities) currently used by any ticket, each sorted."""
+    return ITTicket.distinct_statuses(), ITTicket.distinct_priorities()
+
+
+@st.cache_data(ttl=TICKET_CACHE_TTL, show_spinner=False)
+def ticket_context() -> str:
+    """Short summary of the tickets, given to the AI as context."""
+    # Built from the SQL GROUP BY counts; no ticket rows are loaded
+    status_counts, priority_counts = load_ticket_counts()
+    total = sum(status_counts.values())
+    if total == 0:
+        return "There are no tickets currently in the system."
+
+    # Tickets without a status / priority are left out, as value_counts() did
+    status_counts = {k: v for k, v in status_counts.items() if k is not None}
+    priority_counts = {k: v for k, v in priority_counts.items() if k is not None}
+
+    return (
+        f"There are {total} tickets. "
+        f"Status counts: {status_counts}. "
+        f"Priority counts: {priority_counts}. "
+    )
+
+
+def clear_ticket_cache() -> None:
+    """Drop every cached ticket value; call after creating/updating/deleting."""
+    load_ticket_ids.clear()
+    load_ticket_page_df.clear()
+    load_ticket_counts.clear()
+    load_ticket_options.clear()
+    ticket_context.clear()